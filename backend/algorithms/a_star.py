@@ -1,15 +1,48 @@
-import heapq
-import math
 import time
 
-class AStarM:
-    def __init__(self, start):
-        self.start = self.state_to_tuple(start)
-        self.Goal = (
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8)
-        )
+from algorithms import batch_heuristics
+from algorithms.budget import Budget, run_within_budget
+from algorithms.board import ACTION_CODES, CELL_MASK, GOAL, MOVES, SHIFTS, decode, encode, neighbors
+from algorithms.heuristics import EUCLIDEAN_HEURISTIC, LINEAR_CONFLICT_HEURISTIC, MANHATTAN_HEURISTIC
+from algorithms.numpy_support import require
+from algorithms.open_list import BucketQueue, HeapQueue
+from algorithms.pattern_database import PATTERN_DATABASE_HEURISTIC
+from algorithms.permutation import STATE_COUNT, rank_after_move, reconstruct_coded_path, state_rank
+
+UNSEEN = 0xFF
+
+class AStar:
+    """A* over packed boards. ``heuristic`` is one of the heuristic objects
+    from algorithms.heuristics: its estimate() scores the start board and
+    each successor's value is derived from its parent's with update(), so
+    scoring a node costs O(1).
+
+    The open list is a BucketQueue (lowest f, then highest g) when the
+    heuristic is integral and a heap otherwise; ``bucket_queue`` forces
+    either one.
+
+    With ``batch_size`` set, up to that many open nodes of equal f are
+    expanded together and all their new successors are scored in one call
+    to the NumPy function named by ``batch_heuristic`` (see
+    algorithms.batch_heuristics). That needs numpy and a subclass with a
+    batch heuristic."""
+
+    batch_heuristic = None
+
+    def __init__(self, start, heuristic, budget=None, batch_size=None, bucket_queue=None):
+        self.start = encode(start)
+        self.Goal = GOAL
+        self.heuristic = heuristic
+        self.bucket_queue = heuristic.integral if bucket_queue is None else bucket_queue
+        if self.bucket_queue and not heuristic.integral:
+            raise ValueError("a bucket queue needs an integral heuristic")
+        self.budget = budget or Budget()
+        self.check_at = 0
+        self.batch_size = batch_size
+        if batch_size:
+            if self.batch_heuristic is None:
+                raise ValueError(f"{type(self).__name__} has no batch heuristic")
+            require("batch_size")
 
         self.path = []
         self.moves = []
@@ -17,95 +50,163 @@ class AStarM:
         self.max_depth = 0
         self.runtime = 0.0
         self.found = False
+        self.status = None
+        self.profile = None
     
-    def state_to_tuple(self, state):
-        return tuple(tuple(row) for row in state)
-    
-    def tuple_to_list(self, state_tuple):
-        return [list(row) for row in state_tuple]
-
-    def find_zero(self, state):
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == 0:
-                    return i, j
-
     def get_neighbors(self, state):
-        neighbors = []
-        i, j = self.find_zero(state)
-        directions = [
-            (-1, 0, "Up"),
-            (0, -1, "Left"),
-            (1, 0, "Down"),
-            (0, 1, "Right")
-        ]
-        for di, dj, action in directions:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < 3 and 0 <= nj < 3:
-                new_state = [list(row) for row in state]
-                new_state[i][j], new_state[ni][nj] = new_state[ni][nj], new_state[i][j]
-                neighbors.append((self.state_to_tuple(new_state), action))
-        return neighbors
+        return neighbors(state)
 
-    def manhattan_distance(self, state):
-        distance = 0
-        goal_positions = {
-            0: (0, 0), 1: (0, 1), 2: (0, 2),
-            3: (1, 0), 4: (1, 1), 5: (1, 2),
-            6: (2, 0), 7: (2, 1), 8: (2, 2)
-        }
-        
-        for i in range(3):
-            for j in range(3):
-                tile = state[i][j]
-                if tile != 0:
-                    goal_i, goal_j = goal_positions[tile]
-                    distance += abs(i - goal_i) + abs(j - goal_j)
-        return distance
+    def open_list(self):
+        return BucketQueue() if self.bucket_queue else HeapQueue()
 
     def a_star(self):
-        start_time = time.time()
-        open_set = []
-        heapq.heappush(open_set, (0, 0, self.start, [], []))  # (f, g, state, path, moves)
+        start_time = time.perf_counter_ns()
+        open_set = self.open_list()
+        push = open_set.push
+        pop = open_set.pop
+        start_rank = state_rank(self.start)
+        start_h = self.heuristic.estimate(self.start)
+        push(start_h, 0, (start_h, 0, self.start, start_rank, start_h))  # (f, g, state, rank, h)
         
-        g_scores = {self.start: 0}
-        came_from = {}
+        # Indexed by permutation.state_rank: best g so far and the code of the
+        # move that reached each state, one byte per state instead of dicts
+        g_scores = bytearray([UNSEEN]) * STATE_COUNT
+        came_from = bytearray(STATE_COUNT)
+        g_scores[start_rank] = 0
         self.expanded = 0
         self.max_depth = 0
 
+        profile = self.profile
+        if profile is not None:
+            profile.lap()  # setup is reported as 'other'
         while open_set:
-            f, g, state, path, moves = heapq.heappop(open_set)
+            f, g, state, rank, h = pop()
+            if profile is not None:
+                profile.frontier += profile.lap()
+            if g > g_scores[rank]:
+                continue  # stale entry, a cheaper route to state was pushed later
+            if self.expanded >= self.check_at:
+                self.check_at = self.budget.check(self.expanded, len(open_set), self.max_depth)
             self.expanded += 1
             
-            current_depth = len(moves)
-            if current_depth > self.max_depth:
-                self.max_depth = current_depth
+            if g > self.max_depth:
+                self.max_depth = g
 
             if state == self.Goal:
-                self.path = path + [state]
-                self.moves = moves
+                self.path, self.moves = reconstruct_coded_path(came_from, state, self.start)
                 self.found = True
-                self.runtime = time.time() - start_time
+                self.runtime = (time.perf_counter_ns() - start_time) / 1e9
                 return
 
-            for neighbor, action in self.get_neighbors(state):
+            update = self.heuristic.update
+            blank = state & CELL_MASK
+            for npos, action, tile_factor, blank_offset in MOVES[blank]:
+                tile = (state >> SHIFTS[npos]) & CELL_MASK
+                neighbor = state + tile * tile_factor + blank_offset
+                neighbor_rank = rank_after_move(rank, state, npos)
                 tentative_g = g + 1
+                if profile is not None:
+                    profile.successors += profile.lap()
                 
-                if neighbor not in g_scores or tentative_g < g_scores[neighbor]:
-                    g_scores[neighbor] = tentative_g
-                    h = self.manhattan_distance(neighbor)
-                    f = tentative_g + h
+                if tentative_g < g_scores[neighbor_rank]:
+                    g_scores[neighbor_rank] = tentative_g
+                    came_from[neighbor_rank] = ACTION_CODES[action]
+                    if profile is not None:
+                        profile.visited += profile.lap()
+                    neighbor_h = update(h, state, neighbor, tile, blank, npos)
+                    f = tentative_g + neighbor_h
+                    if profile is not None:
+                        profile.heuristic += profile.lap()
                     
-                    heapq.heappush(open_set, (f, tentative_g, neighbor, path + [state], moves + [action]))
+                    push(f, tentative_g, (f, tentative_g, neighbor, neighbor_rank, neighbor_h))
+                    if profile is not None:
+                        profile.frontier += profile.lap()
+                elif profile is not None:
+                    profile.visited += profile.lap()
 
-        self.runtime = time.time() - start_time
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+        self.found = False
+
+    def a_star_batched(self):
+        """a_star, but expanding up to batch_size nodes of the lowest f at a
+        time and scoring their successors together. Nodes with equal f may
+        be expanded in any order, so the result is still optimal; only
+        the tie-breaking, and so the expanded count, can differ."""
+        start_time = time.perf_counter_ns()
+        score = getattr(batch_heuristics, self.batch_heuristic)
+        open_set = self.open_list()
+        start_rank = state_rank(self.start)
+        start_h = self.heuristic.estimate(self.start)
+        open_set.push(start_h, 0, (start_h, 0, self.start, start_rank))
+
+        g_scores = bytearray([UNSEEN]) * STATE_COUNT
+        came_from = bytearray(STATE_COUNT)
+        g_scores[start_rank] = 0
+        self.expanded = 0
+        self.max_depth = 0
+
+        profile = self.profile
+        if profile is not None:
+            profile.lap()  # setup is reported as 'other'
+        while open_set:
+            # successors waiting to be scored: (g, state, rank)
+            batch = []
+            f = open_set.min_f()
+            taken = 0
+            while open_set and open_set.min_f() == f and taken < self.batch_size:
+                _, g, state, rank = open_set.pop()
+                if profile is not None:
+                    profile.frontier += profile.lap()
+                if g > g_scores[rank]:
+                    continue  # stale entry
+                taken += 1
+                if self.expanded >= self.check_at:
+                    self.check_at = self.budget.check(self.expanded, len(open_set), self.max_depth)
+                self.expanded += 1
+                if g > self.max_depth:
+                    self.max_depth = g
+
+                if state == self.Goal:
+                    self.path, self.moves = reconstruct_coded_path(came_from, state, self.start)
+                    self.found = True
+                    self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+                    return
+
+                blank = state & CELL_MASK
+                tentative_g = g + 1
+                for npos, action, tile_factor, blank_offset in MOVES[blank]:
+                    tile = (state >> SHIFTS[npos]) & CELL_MASK
+                    neighbor = state + tile * tile_factor + blank_offset
+                    neighbor_rank = rank_after_move(rank, state, npos)
+                    if profile is not None:
+                        profile.successors += profile.lap()
+                    if tentative_g < g_scores[neighbor_rank]:
+                        g_scores[neighbor_rank] = tentative_g
+                        came_from[neighbor_rank] = ACTION_CODES[action]
+                        batch.append((tentative_g, neighbor, neighbor_rank))
+                    if profile is not None:
+                        profile.visited += profile.lap()
+
+            if not batch:
+                continue
+            scores = score(batch_heuristics.boards_from_packed([entry[1] for entry in batch])).tolist()
+            if profile is not None:
+                profile.heuristic += profile.lap()
+            for (g, neighbor, neighbor_rank), h in zip(batch, scores):
+                # A later member of the batch may have found a shorter route
+                if g == g_scores[neighbor_rank]:
+                    open_set.push(g + h, g, (g + h, g, neighbor, neighbor_rank))
+            if profile is not None:
+                profile.frontier += profile.lap()
+
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
         self.found = False
 
     def run(self):
-        self.a_star()
+        run_within_budget(self, self.a_star_batched if self.batch_size else self.a_star)
         
     def get_path(self):
-        return [self.tuple_to_list(state) for state in self.path]
+        return [decode(state) for state in self.path]
     
     def get_moves(self):
         return self.moves
@@ -121,136 +222,45 @@ class AStarM:
     
     def get_depth(self):
         return self.max_depth
-    
 
 
+class AStarM(AStar):
+    batch_heuristic = "manhattan"
 
-class AStarE:
-    def __init__(self, start):
-        self.start = self.state_to_tuple(start)
-        self.Goal = (
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8)
-        )
+    def __init__(self, start, budget=None, batch_size=None, bucket_queue=None):
+        super().__init__(start, MANHATTAN_HEURISTIC, budget, batch_size, bucket_queue)
 
-        self.path = []
-        self.moves = []
-        self.expanded = 0
-        self.max_depth = 0
-        self.runtime = 0.0
-        self.found = False
+    def manhattan_distance(self, state):
+        return MANHATTAN_HEURISTIC.estimate(state)
 
-    def state_to_tuple(self, state):
-        return tuple(tuple(row) for row in state)
-    
-    def tuple_to_list(self, state_tuple):
-        return [list(row) for row in state_tuple]
 
-    def find_zero(self, state):
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == 0:
-                    return i, j
+class AStarE(AStar):
+    batch_heuristic = "euclidean"
 
-    def get_neighbors(self, state):
-        neighbors = []
-        i, j = self.find_zero(state)
-        directions = [
-            (-1, 0, "Up"),
-            (0, -1, "Left"),
-            (1, 0, "Down"),
-            (0, 1, "Right")
-        ]
-        for di, dj, action in directions:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < 3 and 0 <= nj < 3:
-                new_state = [list(row) for row in state]
-                new_state[i][j], new_state[ni][nj] = new_state[ni][nj], new_state[i][j]
-                neighbors.append((self.state_to_tuple(new_state), action))
-        return neighbors
+    def __init__(self, start, budget=None, batch_size=None, bucket_queue=None):
+        super().__init__(start, EUCLIDEAN_HEURISTIC, budget, batch_size, bucket_queue)
 
     # === Heuristic: Euclidean Distance ===
     def euclidean_distance(self, state):
-        distance = 0
-        goal_positions = {
-            0: (0, 0), 1: (0, 1), 2: (0, 2),
-            3: (1, 0), 4: (1, 1), 5: (1, 2),
-            6: (2, 0), 7: (2, 1), 8: (2, 2)
-        }
-
-        for i in range(3):
-            for j in range(3):
-                tile = state[i][j]
-                if tile != 0:
-                    goal_i, goal_j = goal_positions[tile]
-                    distance += math.sqrt((i - goal_i)**2 + (j - goal_j)**2)
-        return distance
-
-    def a_star(self):
-        start_time = time.time()
-        open_set = []
-        heapq.heappush(open_set, (0, 0, self.start, [], []))  # (f, g, state, path, moves)
-        
-        g_scores = {self.start: 0}
-        self.expanded = 0
-        self.max_depth = 0
-
-        while open_set:
-            f, g, state, path, moves = heapq.heappop(open_set)
-            self.expanded += 1
-            
-            current_depth = len(moves)
-            if current_depth > self.max_depth:
-                self.max_depth = current_depth
+        return EUCLIDEAN_HEURISTIC.estimate(state)
 
-            if state == self.Goal:
-                self.path = path + [state]
-                self.moves = moves
-                self.found = True
-                self.runtime = time.time() - start_time
-                return
 
-            for neighbor, action in self.get_neighbors(state):
-                tentative_g = g + 1
-                
-                if neighbor not in g_scores or tentative_g < g_scores[neighbor]:
-                    g_scores[neighbor] = tentative_g
-                    h = self.euclidean_distance(neighbor)
-                    f = tentative_g + h
-                    
-                    heapq.heappush(open_set, (f, tentative_g, neighbor, path + [state], moves + [action]))
+class AStarLC(AStar):
+    """A* with Manhattan distance plus linear conflicts."""
 
-        self.runtime = time.time() - start_time
-        self.found = False
+    batch_heuristic = "manhattan_linear_conflict"
 
-    def run(self):
-        self.a_star()
+    def __init__(self, start, budget=None, batch_size=None, bucket_queue=None):
+        super().__init__(start, LINEAR_CONFLICT_HEURISTIC, budget, batch_size, bucket_queue)
 
-    def get_path(self):
-        return [self.tuple_to_list(state) for state in self.path]
-    
-    def get_moves(self):
-        return self.moves
-    
-    def get_cost(self):
-        return len(self.moves)
-    
-    def get_expanded(self):
-        return self.expanded
-    
-    def get_runtime(self):
-        return self.runtime
-    
-    def get_depth(self):
-        return self.max_depth
 
+class AStarPDB(AStar):
+    """A* with the additive 4-4 disjoint pattern databases."""
 
+    def __init__(self, start, budget=None, batch_size=None, bucket_queue=None):
+        super().__init__(start, PATTERN_DATABASE_HEURISTIC, budget, batch_size, bucket_queue)
 
 
-
-    
-    
 if __name__ == "__main__":
     start_state = [
         [1, 5, 2],
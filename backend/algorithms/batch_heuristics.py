@@ -0,0 +1,92 @@
+"""Score many 3x3 boards at once with NumPy.
+
+Boards are an (N, 9) uint8 array in row-major order (an (N, 3, 3) array or
+nested lists work too); ``boards_from_packed`` builds one from packed ints.
+Each heuristic is a lookup in the same tables algorithms.heuristics uses,
+gathered for every board and cell in one indexing operation, so the values
+match the scalar functions (Euclidean up to float summation order).
+
+NumPy is optional. Without it ``available()`` is False and the rest of the
+module raises ImportError when used; the solvers do not need it.
+"""
+
+from algorithms.board import CELL_MASK, SHIFTS, SIZE
+from algorithms.heuristics import EUCLIDEAN, LINE_CELLS, LINE_CONFLICTS, MANHATTAN
+from algorithms.numpy_support import available, np, require
+
+HEURISTICS = ("manhattan", "euclidean", "linear_conflict", "manhattan_linear_conflict", "misplaced")
+
+
+if np is not None:
+    _POSITIONS = np.arange(SIZE)
+    _SHIFTS = np.array(SHIFTS, dtype=np.uint64)
+    _MANHATTAN = np.array(MANHATTAN, dtype=np.int32)
+    _EUCLIDEAN = np.array(EUCLIDEAN, dtype=np.float64)
+    _MISPLACED = np.array(
+        [[int(tile != 0 and tile != pos) for pos in range(SIZE)] for tile in range(SIZE)], dtype=np.int32
+    )
+    # LINE_CONFLICTS[line] is indexed by the line's tiles packed 4 bits each
+    _LINE_CELLS = np.array(LINE_CELLS, dtype=np.intp)
+    _LINE_WEIGHTS = np.array(
+        [1 << (4 * (len(LINE_CELLS[0]) - 1 - k)) for k in range(len(LINE_CELLS[0]))], dtype=np.intp
+    )
+    _LINE_CONFLICTS = np.array([np.frombuffer(table, dtype=np.uint8) for table in LINE_CONFLICTS], dtype=np.int32)
+    _LINES = np.arange(len(LINE_CELLS))
+
+
+def as_boards(boards):
+    """Return boards as an (N, 9) uint8 array, validating the shape."""
+    require("batch heuristic scoring")
+    array = np.asarray(boards, dtype=np.uint8)
+    if array.ndim == 3:
+        array = array.reshape(len(array), -1)
+    if array.ndim != 2 or array.shape[1] != SIZE:
+        raise ValueError(f"expected an (N, {SIZE}) array of boards, got shape {array.shape}")
+    return array
+
+
+def boards_from_packed(states):
+    """Unpack a sequence of packed board ints into an (N, 9) uint8 array."""
+    require("batch heuristic scoring")
+    packed = np.fromiter(states, dtype=np.uint64, count=len(states))
+    return ((packed[:, None] >> _SHIFTS) & np.uint64(CELL_MASK)).astype(np.uint8)
+
+
+def manhattan(boards):
+    boards = as_boards(boards)
+    return _MANHATTAN[boards, _POSITIONS].sum(axis=1)
+
+
+def euclidean(boards):
+    boards = as_boards(boards)
+    return _EUCLIDEAN[boards, _POSITIONS].sum(axis=1)
+
+
+def misplaced(boards):
+    boards = as_boards(boards)
+    return _MISPLACED[boards, _POSITIONS].sum(axis=1)
+
+
+def linear_conflict(boards):
+    """The linear-conflict penalty alone, like heuristics.linear_conflict."""
+    boards = as_boards(boards)
+    keys = boards[:, _LINE_CELLS].astype(np.intp) @ _LINE_WEIGHTS
+    return _LINE_CONFLICTS[_LINES, keys].sum(axis=1)
+
+
+def manhattan_linear_conflict(boards):
+    boards = as_boards(boards)
+    return manhattan(boards) + linear_conflict(boards)
+
+
+def evaluate(boards):
+    """Return {heuristic name: (N,) array} for every name in HEURISTICS."""
+    boards = as_boards(boards)
+    scores = {
+        "manhattan": manhattan(boards),
+        "euclidean": euclidean(boards),
+        "linear_conflict": linear_conflict(boards),
+        "misplaced": misplaced(boards),
+    }
+    scores["manhattan_linear_conflict"] = scores["manhattan"] + scores["linear_conflict"]
+    return scores
@@ -1,14 +1,33 @@
+from array import array
 from collections import deque
 import time
 
+from algorithms import vector_bfs
+from algorithms.budget import Budget, run_within_budget
+from algorithms.numpy_support import require
+from algorithms.board import (
+    ACTION_CODES, CELL_MASK, GOAL, MOVES, encode, decode, neighbors, reconstruct_path,
+)
+from algorithms.permutation import (
+    STATE_COUNT, BitSet, PackedCodes, rank_after_move, reconstruct_coded_path, state_rank,
+    state_unrank,
+)
+
 class BFS:
-    def __init__(self, start):
-        self.start = self.state_to_tuple(start)
-        self.Goal = (
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8)
-        )
+    """Breadth-first search. ``compact`` keeps the visited set and parents
+    in bit arrays; ``vectorized`` expands whole layers with NumPy
+    (algorithms.vector_bfs). All three find the same path with the same
+    expanded count."""
+
+    def __init__(self, start, compact=False, budget=None, vectorized=False):
+        if vectorized:
+            require("vectorized BFS")
+        self.start = encode(start)
+        self.Goal = GOAL
+        self.compact = compact
+        self.vectorized = vectorized
+        self.budget = budget or Budget()
+        self.check_at = 0
 
         self.path = []
         self.moves = []
@@ -16,74 +35,167 @@ class BFS:
         self.max_depth = 0
         self.runtime = 0.0
         self.found = False
+        self.status = None
+        self.profile = None
     
-    def state_to_tuple(self, state):
-        return tuple(tuple(row) for row in state)
-    
-    def tuple_to_list(self, state_tuple):
-        return [list(row) for row in state_tuple]
-
-    def find_zero(self, state):
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == 0:
-                    return i, j
-
     def get_neighbors(self, state):
-        neighbors = []
-        i, j = self.find_zero(state)
-        directions = [
-            (-1, 0, "Up"),
-            (0, -1, "Left"),
-            (1, 0, "Down"),
-            (0, 1, "Right")
-        ]
-        for di, dj, action in directions:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < 3 and 0 <= nj < 3:
-                new_state = [list(row) for row in state]
-                new_state[i][j], new_state[ni][nj] = new_state[ni][nj], new_state[i][j]
-                neighbors.append((self.state_to_tuple(new_state), action))
-        return neighbors
+        return neighbors(state)
 
     def bfs(self):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         queue = deque()
-        visited = set()
-        
-        queue.append((self.start, [self.start], []))
-        visited.add(self.start)
+        parents = {self.start: None}  # state -> (parent, action), doubles as the visited set
+
+        queue.append((self.start, 0))
         self.expanded = 0
         self.max_depth = 0
 
+        profile = self.profile
+        if profile is not None:
+            profile.lap()  # setup is reported as 'other'
         while queue:
-            state, path, moves = queue.popleft()
+            state, current_depth = queue.popleft()
+            if profile is not None:
+                profile.frontier += profile.lap()
+            if self.expanded >= self.check_at:
+                self.check_at = self.budget.check(self.expanded, len(queue), current_depth)
             self.expanded += 1
             
-            current_depth = len(moves)
             if current_depth > self.max_depth:
                 self.max_depth = current_depth
 
             if state == self.Goal:
-                self.path = path
-                self.moves = moves
+                self.path, self.moves = reconstruct_path(parents, state)
                 self.found = True
-                self.runtime = time.time() - start_time
+                self.runtime = (time.perf_counter_ns() - start_time) / 1e9
                 return
 
-            for neighbor, action in self.get_neighbors(state):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor], moves + [action]))
+            successors = neighbors(state)
+            if profile is not None:
+                profile.successors += profile.lap()
+            for neighbor, action in successors:
+                if neighbor not in parents:
+                    parents[neighbor] = (state, action)
+                    if profile is not None:
+                        profile.visited += profile.lap()
+                    queue.append((neighbor, current_depth + 1))
+                    if profile is not None:
+                        profile.frontier += profile.lap()
+            if profile is not None:
+                profile.visited += profile.lap()
+
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+        self.found = False
+
+    def bfs_compact(self):
+        """Same search as bfs(), but with a 9!-bit visited set, 2-bit move
+        codes per rank and level-by-level array('I') frontiers of ranks, so
+        even a full exhaustion stays well under a megabyte."""
+        start_time = time.perf_counter_ns()
+        visited = BitSet(STATE_COUNT)
+        came_from = PackedCodes(STATE_COUNT)
+        visited_bits = visited.bits
+        code_bits = came_from.bits
+
+        start_rank = state_rank(self.start)
+        visited.add(start_rank)
+        frontier = array('I', [start_rank])
+        current_depth = 0
+        self.expanded = 0
+        self.max_depth = 0
+
+        profile = self.profile
+        if profile is not None:
+            profile.lap()  # setup is reported as 'other'
+        while frontier:
+            next_frontier = array('I')
+            self.max_depth = current_depth
+            for rank in frontier:
+                state = state_unrank(rank)
+                if profile is not None:
+                    profile.frontier += profile.lap()
+                if self.expanded >= self.check_at:
+                    self.check_at = self.budget.check(
+                        self.expanded, len(frontier) + len(next_frontier), current_depth
+                    )
+                self.expanded += 1
+
+                if state == self.Goal:
+                    self.path, self.moves = reconstruct_coded_path(came_from, state, self.start)
+                    self.found = True
+                    self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+                    return
+
+                for npos, action, tile_factor, blank_offset in MOVES[state & CELL_MASK]:
+                    neighbor_rank = rank_after_move(rank, state, npos)
+                    if profile is not None:
+                        profile.successors += profile.lap()
+                    byte = neighbor_rank >> 3
+                    mask = 1 << (neighbor_rank & 7)
+                    if not visited_bits[byte] & mask:
+                        visited_bits[byte] |= mask
+                        shift = (neighbor_rank & 3) << 1
+                        code_bits[neighbor_rank >> 2] |= ACTION_CODES[action] << shift
+                        if profile is not None:
+                            profile.visited += profile.lap()
+                        next_frontier.append(neighbor_rank)
+                        if profile is not None:
+                            profile.frontier += profile.lap()
+                    elif profile is not None:
+                        profile.visited += profile.lap()
+
+            frontier = next_frontier
+            current_depth += 1
+
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+        self.found = False
+
+    def bfs_vectorized(self):
+        """bfs() a layer at a time. The budget is checked at the same
+        expansion counts the queue would check it at, so ``max_expanded``
+        stops the search on the same node and with the same stats."""
+        start_time = time.perf_counter_ns()
+        came_from = vector_bfs.np.zeros(STATE_COUNT, dtype=vector_bfs.np.uint8)
+        goal_rank = state_rank(self.Goal)
+        self.expanded = 0
+        self.max_depth = 0
+
+        profile = self.profile
+        if profile is not None:
+            profile.lap()  # setup is reported as 'other'
+        for depth, (ranks, _, _, codes) in enumerate(vector_bfs.layers(self.start, profile)):
+            came_from[ranks] = codes
+            hits = vector_bfs.np.flatnonzero(ranks == goal_rank)
+            if profile is not None:
+                profile.visited += profile.lap()
+            # A FIFO queue would pop the layer up to the goal, if it is here
+            layer_end = self.expanded + (int(hits[0]) + 1 if len(hits) else len(ranks))
+            while self.check_at < layer_end:
+                popped = max(self.check_at, self.expanded)
+                if popped > self.expanded:
+                    self.max_depth = depth
+                self.expanded = popped
+                self.check_at = self.budget.check(popped, layer_end - popped, depth)
+            self.max_depth = depth
+            self.expanded = layer_end
+            if len(hits):
+                self.path, self.moves = reconstruct_coded_path(came_from, self.Goal, self.start)
+                self.found = True
+                self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+                return
 
-        self.runtime = time.time() - start_time
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
         self.found = False
 
     def run(self):
-        self.bfs()
+        if self.vectorized:
+            search = self.bfs_vectorized
+        else:
+            search = self.bfs_compact if self.compact else self.bfs
+        run_within_budget(self, search)
         
     def get_path(self):
-        return [self.tuple_to_list(state) for state in self.path]
+        return [decode(state) for state in self.path]
     
     def get_moves(self):
         return self.moves
@@ -0,0 +1,155 @@
+import time
+
+from algorithms.budget import Budget, run_within_budget
+from algorithms.board import (
+    ACTION_CODES, ACTIONS, GOAL, INVERSE_CODES, encode, decode, neighbors, reconstruct_path,
+)
+
+class BidirectionalBFS:
+    def __init__(self, start, budget=None):
+        self.start = encode(start)
+        self.Goal = GOAL
+        self.budget = budget or Budget()
+        self.check_at = 0
+
+        self.path = []
+        self.moves = []
+        self.expanded = 0
+        self.max_depth = 0
+        self.runtime = 0.0
+        self.found = False
+        self.status = None
+        self.profile = None
+
+    def get_neighbors(self, state):
+        return neighbors(state)
+
+    def expand_layer(self, frontier, parents, depths, other_depths, backward):
+        """Expand one whole BFS layer; return (next layer, best meeting state).
+
+        Forward parents map state -> (parent, action from parent). Backward
+        parents map state -> (next state towards the goal, action to take).
+        """
+        next_frontier = []
+        best_state = None
+        best_cost = None
+        profile = self.profile
+        for state in frontier:
+            if self.expanded >= self.check_at:
+                self.check_at = self.budget.check(
+                    self.expanded, len(frontier) + len(next_frontier), self.max_depth
+                )
+            self.expanded += 1
+            depth = depths[state] + 1
+            successors = neighbors(state)
+            if profile is not None:
+                profile.successors += profile.lap()
+            for neighbor, action in successors:
+                if neighbor in depths:
+                    continue
+                if backward:
+                    parents[neighbor] = (state, ACTIONS[INVERSE_CODES[ACTION_CODES[action]]])
+                else:
+                    parents[neighbor] = (state, action)
+                depths[neighbor] = depth
+                if profile is not None:
+                    profile.visited += profile.lap()
+                next_frontier.append(neighbor)
+                if profile is not None:
+                    profile.frontier += profile.lap()
+                if neighbor in other_depths:
+                    cost = depth + other_depths[neighbor]
+                    if best_cost is None or cost < best_cost:
+                        best_state, best_cost = neighbor, cost
+            if profile is not None:
+                profile.visited += profile.lap()
+        return next_frontier, best_state
+
+    def splice(self, meet, forward_parents, backward_parents):
+        path, moves = reconstruct_path(forward_parents, meet)
+        state = meet
+        while backward_parents[state] is not None:
+            state, action = backward_parents[state]
+            path.append(state)
+            moves.append(action)
+        return path, moves
+
+    def bidirectional_bfs(self):
+        start_time = time.perf_counter_ns()
+        self.expanded = 0
+        self.max_depth = 0
+
+        forward_parents = {self.start: None}
+        backward_parents = {self.Goal: None}
+        forward_depths = {self.start: 0}
+        backward_depths = {self.Goal: 0}
+        forward_frontier = [self.start]
+        backward_frontier = [self.Goal]
+        forward_layers = 0
+        backward_layers = 0
+
+        if self.profile is not None:
+            self.profile.lap()  # setup is reported as 'other'
+        meet = self.start if self.start == self.Goal else None
+        # Always grow the smaller frontier; a layer is finished before checking
+        # for a meeting point so the spliced path is a shortest one.
+        while meet is None and forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meet = self.expand_layer(
+                    forward_frontier, forward_parents, forward_depths, backward_depths, False
+                )
+                forward_layers += 1
+            else:
+                backward_frontier, meet = self.expand_layer(
+                    backward_frontier, backward_parents, backward_depths, forward_depths, True
+                )
+                backward_layers += 1
+            self.max_depth = forward_layers + backward_layers
+
+        if meet is not None:
+            self.path, self.moves = self.splice(meet, forward_parents, backward_parents)
+            self.found = True
+        else:
+            self.found = False
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+
+    def run(self):
+        run_within_budget(self, self.bidirectional_bfs)
+
+    def get_path(self):
+        return [decode(state) for state in self.path]
+
+    def get_moves(self):
+        return self.moves
+
+    def get_cost(self):
+        return len(self.moves)
+
+    def get_expanded(self):
+        return self.expanded
+
+    def get_runtime(self):
+        return self.runtime
+
+    def get_depth(self):
+        return self.max_depth
+
+
+if __name__ == "__main__":
+    start_state = [
+        [8, 6, 7],
+        [2, 5, 4],
+        [3, 0, 1]
+    ]
+
+    solver = BidirectionalBFS(start_state)
+    solver.run()
+    print("=== Bidirectional BFS Results ===")
+    print("Solution found:", solver.found)
+    print("Path length:", len(solver.get_path()))
+    print("Cost:", solver.get_cost())
+    print("Nodes expanded:", solver.get_expanded())
+    print("Max depth reached:", solver.get_depth())
+    print("Runtime:", solver.get_runtime(), "seconds")
+    if solver.found:
+        print("Moves:", solver.get_moves())
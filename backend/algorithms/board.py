@@ -0,0 +1,180 @@
+"""Packed-integer board representation shared by all solvers.
+
+A board is a single int: the blank index lives in the low ``bits`` bits and
+cell ``i`` (row-major) holds its tile in the ``bits`` bits at ``shifts[i]``,
+with cell 0 most significant. That keeps integer order identical to the old
+row-major tuple order, so heap tie-breaking is unchanged. Successors are
+produced with integer arithmetic from a precomputed move table, so no lists
+or tuples are allocated while searching.
+
+``Geometry`` holds those tables for any rows x cols board (4 bits per cell up
+to 4x4, 5 bits for 5x5). The module-level names are the 3x3 instance, which
+every solver except IDA* is specialised for.
+"""
+
+from functools import lru_cache
+
+# (row delta, col delta, action) in the order the solvers have always used
+DIRECTIONS = [
+    (-1, 0, "Up"),
+    (0, -1, "Left"),
+    (1, 0, "Down"),
+    (0, 1, "Right")
+]
+
+ACTIONS = tuple(action for _, _, action in DIRECTIONS)
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+# Undoing a move is the move two steps further round the direction list
+INVERSE_CODES = tuple((code + 2) % len(ACTIONS) for code in range(len(ACTIONS)))
+
+
+class Geometry:
+    """Move tables and packing for a rows x cols board whose goal has the
+    blank in cell 0 and tiles 1..size-1 in row-major order."""
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.bits = max(4, (self.size - 1).bit_length())
+        self.cell_mask = (1 << self.bits) - 1
+        self.shifts = tuple(self.bits * (self.size - pos) for pos in range(self.size))
+        self.moves = self._build_moves()
+        self.moves_by_code = self._build_moves_by_code()
+        self.goal = self.encode([
+            list(range(r * cols, (r + 1) * cols)) for r in range(rows)
+        ])
+
+    def _build_moves(self):
+        # moves[blank] -> tuple of (new_blank, action, tile_factor, blank_offset)
+        # new_state = state + tile * tile_factor + blank_offset
+        moves = []
+        for pos in range(self.size):
+            i, j = divmod(pos, self.cols)
+            entries = []
+            for di, dj, action in DIRECTIONS:
+                ni, nj = i + di, j + dj
+                if 0 <= ni < self.rows and 0 <= nj < self.cols:
+                    npos = ni * self.cols + nj
+                    tile_factor = (1 << self.shifts[pos]) - (1 << self.shifts[npos])
+                    blank_offset = npos - pos
+                    entries.append((npos, action, tile_factor, blank_offset))
+            moves.append(tuple(entries))
+        return tuple(moves)
+
+    def _build_moves_by_code(self):
+        # moves_by_code[blank][action code] -> the moves entry, or None at an edge
+        moves_by_code = []
+        for entries in self.moves:
+            by_code = [None] * len(ACTIONS)
+            for move in entries:
+                by_code[ACTION_CODES[move[1]]] = move
+            moves_by_code.append(tuple(by_code))
+        return tuple(moves_by_code)
+
+    def encode(self, state):
+        """Pack a grid (list or tuple of rows) into an int."""
+        shifts = self.shifts
+        packed = 0
+        blank = 0
+        pos = 0
+        for row in state:
+            for tile in row:
+                if tile == 0:
+                    blank = pos
+                packed |= tile << shifts[pos]
+                pos += 1
+        return packed | blank
+
+    def decode(self, packed):
+        """Unpack an int into a list-of-lists grid."""
+        shifts = self.shifts
+        mask = self.cell_mask
+        cols = self.cols
+        return [
+            [(packed >> shifts[i * cols + j]) & mask for j in range(cols)]
+            for i in range(self.rows)
+        ]
+
+    def neighbors(self, packed):
+        """Return [(successor, action), ...] for every legal blank move."""
+        shifts = self.shifts
+        mask = self.cell_mask
+        result = []
+        for npos, action, tile_factor, blank_offset in self.moves[packed & mask]:
+            tile = (packed >> shifts[npos]) & mask
+            result.append((packed + tile * tile_factor + blank_offset, action))
+        return result
+
+    def is_solvable(self, packed):
+        """Whether the goal can be reached from ``packed``.
+
+        A slide along a row never changes the parity of the tile
+        permutation; a slide along a column moves one tile past cols - 1
+        others. With an odd width that keeps the parity, so it must be even
+        like the goal's. With an even width every vertical move flips it and
+        also moves the blank one row, so inversions + blank row must stay
+        even.
+        """
+        tiles = [
+            (packed >> self.shifts[pos]) & self.cell_mask for pos in range(self.size)
+        ]
+        tiles = [tile for tile in tiles if tile]
+        inversions = sum(
+            1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j]
+        )
+        if self.cols % 2:
+            return inversions % 2 == 0
+        blank_row = (packed & self.cell_mask) // self.cols
+        return (inversions + blank_row) % 2 == 0
+
+
+@lru_cache(maxsize=None)
+def get_geometry(rows, cols):
+    return Geometry(rows, cols)
+
+
+def geometry_of(grid):
+    """The Geometry matching a list-of-rows grid's shape."""
+    return get_geometry(len(grid), len(grid[0]))
+
+
+BOARD_3X3 = get_geometry(3, 3)
+
+ROWS = BOARD_3X3.rows
+COLS = BOARD_3X3.cols
+SIZE = BOARD_3X3.size
+
+BITS = BOARD_3X3.bits
+CELL_MASK = BOARD_3X3.cell_mask
+SHIFTS = BOARD_3X3.shifts
+
+MOVES = BOARD_3X3.moves
+MOVES_BY_CODE = BOARD_3X3.moves_by_code
+
+encode = BOARD_3X3.encode
+decode = BOARD_3X3.decode
+neighbors = BOARD_3X3.neighbors
+
+
+def reconstruct_path(parents, state):
+    """Rebuild (path, moves) by following ``parents[state] = (parent, action)``
+    back to the root, whose entry is ``None``."""
+    path = []
+    moves = []
+    while state is not None:
+        path.append(state)
+        entry = parents[state]
+        if entry is None:
+            break
+        state, action = entry
+        moves.append(action)
+    path.reverse()
+    moves.reverse()
+    return path, moves
+
+
+GOAL = BOARD_3X3.goal
+
+# Longest optimal solution of any solvable 3x3 board
+MAX_SOLUTION_LENGTH = 31
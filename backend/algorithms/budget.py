@@ -0,0 +1,94 @@
+"""Cooperative node and time budgets for the solvers.
+
+A solver keeps a ``check_at`` expansion count and only calls
+``Budget.check`` once it gets there, so the hot loops pay one integer
+comparison per node. ``check`` raises ``BudgetExceeded`` when the budget is
+spent and otherwise returns the next count to check at; the clock is read at
+most once every ``CHECK_INTERVAL`` expansions.
+
+The same slow path drives the optional progress hook: ``on_progress`` is
+called with (expanded, frontier size, max depth) at most once every
+``progress_interval`` expansions, and costs nothing while it is None.
+
+``run_within_budget`` wraps a solver's search method: on ``BudgetExceeded``
+the solver keeps the expanded/max_depth it reached and reports the status
+``budget_exceeded`` instead of a path.
+"""
+
+import time
+
+SOLVED = "solved"
+NOT_FOUND = "not_found"
+BUDGET_EXCEEDED = "budget_exceeded"
+
+CHECK_INTERVAL = 1024
+PROGRESS_INTERVAL = 8192
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Budget:
+    """Limits on one solver run. ``max_expanded`` counts expanded nodes,
+    ``timeout_ms`` is wall-clock time from start(); None means unlimited.
+    ``on_progress`` may be set or cleared while the solver is running."""
+
+    def __init__(self, max_expanded=None, timeout_ms=None, on_progress=None,
+                 progress_interval=PROGRESS_INTERVAL):
+        self.max_expanded = max_expanded
+        self.timeout_ms = timeout_ms
+        self.deadline = None
+        self.cancelled = False
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.next_progress = 0
+
+    def start(self):
+        """Arm the timer; returns the first expansion count to check at."""
+        if self.timeout_ms is not None:
+            self.deadline = time.monotonic() + self.timeout_ms / 1000
+        return self.next_check(0)
+
+    def next_check(self, expanded):
+        check_at = expanded + CHECK_INTERVAL
+        if self.max_expanded is not None and self.max_expanded < check_at:
+            check_at = self.max_expanded
+        return check_at
+
+    def check(self, expanded, frontier=0, depth=0):
+        if self.max_expanded is not None and expanded >= self.max_expanded:
+            raise BudgetExceeded("max_expanded")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise BudgetExceeded("timeout")
+        if self.cancelled:
+            raise BudgetExceeded("cancelled")
+        on_progress = self.on_progress
+        if on_progress is not None and expanded >= self.next_progress:
+            self.next_progress = expanded + self.progress_interval
+            on_progress(expanded, frontier, depth)
+        return self.next_check(expanded)
+
+    def cancel(self):
+        """Ask the solver to stop at its next check; safe from other threads."""
+        self.cancelled = True
+
+
+def run_within_budget(solver, search):
+    """Run ``search`` (a bound solver method) and set ``solver.status``."""
+    start_time = time.perf_counter_ns()
+    solver.check_at = solver.budget.start()
+    if solver.profile is not None:
+        solver.profile.start()
+    try:
+        search()
+    except BudgetExceeded:
+        solver.path = []
+        solver.moves = []
+        solver.found = False
+        solver.status = BUDGET_EXCEEDED
+        solver.runtime = (time.perf_counter_ns() - start_time) / 1e9
+        return
+    solver.status = SOLVED if solver.found else NOT_FOUND
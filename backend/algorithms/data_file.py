@@ -0,0 +1,74 @@
+"""Versioned, checksummed binary files that workers memory-map.
+
+Every file starts with a fixed-size little-endian header laid out as::
+
+    magic     4s
+    version   u16
+    header    u16  header size in bytes
+    ...            format-specific layout fields
+    crc32     u32  zlib.crc32 of everything after the header
+    (pad)
+
+followed by the payload. ``save`` writes a file atomically, so readers never
+see a partial one, and ``load`` maps it read-only after checking the header
+and checksum, so every process shares the same page-cached copy and loading
+does no computation.
+"""
+
+import mmap
+import os
+import tempfile
+import zlib
+
+
+def save(path, header, magic, version, fields, payload, prefix):
+    """Write ``payload`` under a header packed from ``fields`` (the layout
+    fields between the header size and the checksum)."""
+    packed = header.pack(magic, version, header.size, *fields, zlib.crc32(payload))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(packed)
+            f.write(payload)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load(path, header, magic, version, kind, payload_size, check_fields):
+    """Map a file read-only and return a memoryview over its payload.
+
+    ``check_fields(fields)`` gets the layout fields and returns an error
+    message if they do not describe the expected payload, or None.
+    Raises ValueError if the file is not a valid ``kind`` file.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < header.size:
+        mapped.close()
+        raise ValueError(f"{path}: truncated header")
+
+    file_magic, file_version, header_size, *fields, checksum = header.unpack_from(mapped)
+    if file_magic != magic:
+        error = f"not a {kind} file"
+    elif file_version != version:
+        error = f"unsupported format version {file_version}"
+    elif header_size != header.size:
+        error = "unexpected header size"
+    else:
+        error = check_fields(fields)
+    if error is None and len(mapped) != header_size + payload_size:
+        error = "file length does not match header"
+    if error is None:
+        payload = memoryview(mapped)[header_size:]
+        if zlib.crc32(payload) == checksum:
+            return payload
+        payload.release()
+        error = "checksum mismatch"
+
+    mapped.close()
+    raise ValueError(f"{path}: {error}")
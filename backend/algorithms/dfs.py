@@ -1,14 +1,15 @@
 from collections import deque
 import time
 
+from algorithms.budget import Budget, run_within_budget
+from algorithms.board import GOAL, encode, decode, neighbors
+
 class DFS:
-    def __init__(self, start):
-        self.start = self.state_to_tuple(start)
-        self.Goal = (
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8)
-        )
+    def __init__(self, start, budget=None):
+        self.start = encode(start)
+        self.Goal = GOAL
+        self.budget = budget or Budget()
+        self.check_at = 0
 
         self.path = []
         self.moves = []
@@ -16,72 +17,75 @@ class DFS:
         self.max_depth = 0
         self.runtime = 0.0
         self.found = False
+        self.status = None
+        self.profile = None
     
-    def state_to_tuple(self, state):
-        return tuple(tuple(row) for row in state)
-    
-    def tuple_to_list(self, state_tuple):
-        return [list(row) for row in state_tuple]
-
-    def find_zero(self, state):
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == 0:
-                    return i, j
-
     def get_neighbors(self, state):
-        neighbors = []
-        i, j = self.find_zero(state)
-        directions = [
-            (-1, 0, "Up"),
-            (0, -1, "Left"),
-            (1, 0, "Down"),
-            (0, 1, "Right")
-        ]
-        for di, dj, action in directions:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < 3 and 0 <= nj < 3:
-                new_state = [list(row) for row in state]
-                new_state[i][j], new_state[ni][nj] = new_state[ni][nj], new_state[i][j]
-                neighbors.append((self.state_to_tuple(new_state), action))
-        return neighbors
+        return neighbors(state)
 
     def dfs(self):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
-        stack = [(self.start, [self.start], [], set([self.start]))]
+        # The stack holds (state, depth, action); the current root-to-node path
+        # is kept once in `path`/`actions` and trimmed when we backtrack, so
+        # each frame costs O(1) instead of copying the path and visited set.
+        stack = [(self.start, 0, None)]
+        path = []
+        actions = []
+        on_path = set()
         self.expanded = 0
         self.max_depth = 0
 
+        profile = self.profile
+        if profile is not None:
+            profile.lap()  # setup is reported as 'other'
         while stack:
-            state, path, moves, visited_local = stack.pop()
+            state, current_depth, action = stack.pop()
+            if profile is not None:
+                profile.frontier += profile.lap()
+            while len(path) > current_depth:
+                on_path.discard(path.pop())
+                actions.pop()
+            path.append(state)
+            actions.append(action)
+            on_path.add(state)
+            if profile is not None:
+                profile.visited += profile.lap()
+            if self.expanded >= self.check_at:
+                self.check_at = self.budget.check(self.expanded, len(stack), self.max_depth)
             self.expanded += 1
             
-            current_depth = len(moves)
             if current_depth > self.max_depth:
                 self.max_depth = current_depth
 
             if state == self.Goal:
                 self.path = path
-                self.moves = moves
+                self.moves = actions[1:]
                 self.found = True
-                self.runtime = time.time() - start_time
+                self.runtime = (time.perf_counter_ns() - start_time) / 1e9
                 return
 
-            for neighbor, action in reversed(self.get_neighbors(state)):
-                if neighbor not in visited_local:
-                    new_visited = visited_local.copy()
-                    new_visited.add(neighbor)
-                    stack.append((neighbor, path + [neighbor], moves + [action], new_visited))
+            successors = neighbors(state)
+            if profile is not None:
+                profile.successors += profile.lap()
+            for neighbor, action in reversed(successors):
+                if neighbor not in on_path:
+                    if profile is not None:
+                        profile.visited += profile.lap()
+                    stack.append((neighbor, current_depth + 1, action))
+                    if profile is not None:
+                        profile.frontier += profile.lap()
+            if profile is not None:
+                profile.visited += profile.lap()
 
-        self.runtime = time.time() - start_time
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
         self.found = False
 
     def run(self):
-        self.dfs()
+        run_within_budget(self, self.dfs)
         
     def get_path(self):
-        return [self.tuple_to_list(state) for state in self.path]
+        return [decode(state) for state in self.path]
     
     def get_moves(self):
         return self.moves
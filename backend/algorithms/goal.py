@@ -0,0 +1,100 @@
+"""Solving towards a goal other than the standard one.
+
+Every solver, table and cache assumes the standard goal: blank in cell 0 and
+tiles 1..n-1 in row-major order. A (board, goal) pair is turned into the
+equivalent standard problem in two steps:
+
+1. mirror both grids top-to-bottom and/or left-to-right so the goal's blank
+   ends up in the top-left corner, then
+2. relabel every tile with the number the standard goal has in the cell that
+   tile occupies in the mirrored goal.
+
+Both steps map legal moves onto legal moves, so costs and solvability carry
+over, and a solution maps back by mirroring its path and move directions.
+Mirrors (and, on square boards, the transpose) only ever send corners to
+corners, so goals with the blank anywhere else cannot be mapped this way.
+"""
+
+ROW_MIRRORED_MOVES = {"Up": "Down", "Down": "Up", "Left": "Left", "Right": "Right"}
+COL_MIRRORED_MOVES = {"Up": "Up", "Down": "Down", "Left": "Right", "Right": "Left"}
+
+
+def blank_cell(grid):
+    for i, row in enumerate(grid):
+        for j, tile in enumerate(row):
+            if tile == 0:
+                return i, j
+    return None
+
+
+def blank_in_corner(grid):
+    i, j = blank_cell(grid)
+    return i in (0, len(grid) - 1) and j in (0, len(grid[0]) - 1)
+
+
+def is_standard_goal(grid):
+    cols = len(grid[0])
+    return all(tile == i * cols + j for i, row in enumerate(grid) for j, tile in enumerate(row))
+
+
+class GoalMapping:
+    """Maps boards between a goal with its blank in a corner and the
+    standard goal of the same shape."""
+
+    def __init__(self, goal):
+        if not blank_in_corner(goal):
+            raise ValueError("goal must have the blank in a corner")
+        self.rows = len(goal)
+        self.cols = len(goal[0])
+        blank_row, blank_col = blank_cell(goal)
+        self.flip_rows = blank_row != 0
+        self.flip_cols = blank_col != 0
+
+        # Tile t of the caller's goal becomes to_standard[t]
+        self.to_standard = [0] * (self.rows * self.cols)
+        for i, row in enumerate(goal):
+            for j, tile in enumerate(row):
+                mi, mj = self._mirror(i, j)
+                self.to_standard[tile] = mi * self.cols + mj
+        self.from_standard = [0] * len(self.to_standard)
+        for tile, label in enumerate(self.to_standard):
+            self.from_standard[label] = tile
+
+        moves = {move: move for move in ROW_MIRRORED_MOVES}
+        if self.flip_rows:
+            moves = {move: ROW_MIRRORED_MOVES[mapped] for move, mapped in moves.items()}
+        if self.flip_cols:
+            moves = {move: COL_MIRRORED_MOVES[mapped] for move, mapped in moves.items()}
+        self.moves = moves
+
+    def _mirror(self, i, j):
+        if self.flip_rows:
+            i = self.rows - 1 - i
+        if self.flip_cols:
+            j = self.cols - 1 - j
+        return i, j
+
+    def _remap(self, grid, labels):
+        # Mirroring is its own inverse, so the same cell map works both ways
+        mapped = [[None] * self.cols for _ in range(self.rows)]
+        for i, row in enumerate(grid):
+            for j, tile in enumerate(row):
+                mi, mj = self._mirror(i, j)
+                mapped[mi][mj] = labels[tile]
+        return mapped
+
+    def to_board(self, grid):
+        """The board in the standard problem that corresponds to grid."""
+        return self._remap(grid, self.to_standard)
+
+    def from_board(self, grid):
+        """Inverse of to_board."""
+        return self._remap(grid, self.from_standard)
+
+    def map_result(self, result):
+        """Map a result payload for the standard problem back onto the
+        caller's board and goal."""
+        mapped = dict(result)
+        mapped['path'] = [self.from_board(grid) for grid in result['path']]
+        mapped['moves'] = [self.moves[move] for move in result['moves']]
+        return mapped
@@ -0,0 +1,257 @@
+"""Admissible heuristics for the packed boards in ``algorithms.board``.
+
+Everything is table driven so solvers can update an estimate in O(1) when a
+single tile slides instead of rescanning the board. The module-level tables
+are for 3x3; ``get_linear_conflict_heuristic`` builds the same estimate for
+any ``board.Geometry``.
+"""
+
+from functools import lru_cache
+import math
+
+from algorithms.board import BOARD_3X3, CELL_MASK, COLS, ROWS, SHIFTS, SIZE
+
+
+def _build_tile_table(distance, rows=ROWS, cols=COLS):
+    # table[tile][pos]: distance(row delta, col delta) from pos to the
+    # tile's goal cell; the blank contributes nothing
+    size = rows * cols
+    table = []
+    for tile in range(size):
+        goal_i, goal_j = divmod(tile, cols)
+        row = []
+        for pos in range(size):
+            i, j = divmod(pos, cols)
+            row.append(0 if tile == 0 else distance(i - goal_i, j - goal_j))
+        table.append(tuple(row))
+    return tuple(table)
+
+
+MANHATTAN = _build_tile_table(lambda di, dj: abs(di) + abs(dj))
+EUCLIDEAN = _build_tile_table(lambda di, dj: math.sqrt(di ** 2 + dj ** 2))
+
+
+def manhattan_distance(state):
+    return sum(MANHATTAN[(state >> SHIFTS[pos]) & CELL_MASK][pos] for pos in range(SIZE))
+
+
+def _build_line_cells(rows, cols):
+    # Lines 0..rows-1 are rows, the rest are columns
+    return tuple(
+        [tuple(range(r * cols, (r + 1) * cols)) for r in range(rows)]
+        + [tuple(range(c, rows * cols, cols)) for c in range(cols)]
+    )
+
+
+LINE_CELLS = _build_line_cells(ROWS, COLS)
+
+
+def _longest_increasing(values):
+    best = []
+    for k, value in enumerate(values):
+        best.append(1 + max([best[m] for m in range(k) if values[m] < value], default=0))
+    return max(best, default=0)
+
+
+def _line_penalty(line, tiles, rows=ROWS, cols=COLS):
+    # Tiles already in their goal line whose order is wrong must leave the
+    # line to get past each other: two extra moves per tile that has to yield.
+    if line < rows:
+        goals = [tile % cols for tile in tiles if tile and tile // cols == line]
+    else:
+        goals = [tile // cols for tile in tiles if tile and tile % cols == line - rows]
+    return 2 * (len(goals) - _longest_increasing(goals))
+
+
+def _line_key(state, cells):
+    key = 0
+    for pos in cells:
+        key = (key << 4) | ((state >> SHIFTS[pos]) & CELL_MASK)
+    return key
+
+
+def _build_line_conflicts():
+    # LINE_CONFLICTS[line][key] with key = the line's tiles packed 4 bits each
+    tables = []
+    for line, cells in enumerate(LINE_CELLS):
+        table = []
+        for key in range(1 << (4 * len(cells))):
+            tiles = [(key >> (4 * (len(cells) - 1 - k))) & CELL_MASK for k in range(len(cells))]
+            table.append(_line_penalty(line, tiles))
+        tables.append(bytes(table))
+    return tuple(tables)
+
+
+LINE_CONFLICTS = _build_line_conflicts()
+
+
+def line_conflict(state, line):
+    return LINE_CONFLICTS[line][_line_key(state, LINE_CELLS[line])]
+
+
+def linear_conflict(state):
+    return sum(line_conflict(state, line) for line in range(len(LINE_CELLS)))
+
+
+def manhattan_linear_conflict(state):
+    return manhattan_distance(state) + linear_conflict(state)
+
+
+def _build_affected_lines(rows=ROWS, cols=COLS):
+    # AFFECTED_LINES[blank][npos]: lines whose conflicts can change when the
+    # tile at npos slides into blank. A horizontal slide keeps the tile's row
+    # (and its order within it) but changes its column, and vice versa.
+    size = rows * cols
+    affected = [[None] * size for _ in range(size)]
+    for blank in range(size):
+        for npos in range(size):
+            if blank // cols == npos // cols:
+                affected[blank][npos] = (rows + blank % cols, rows + npos % cols)
+            else:
+                affected[blank][npos] = (blank // cols, npos // cols)
+    return tuple(tuple(row) for row in affected)
+
+
+AFFECTED_LINES = _build_affected_lines()
+
+
+def manhattan_linear_conflict_delta(state, neighbor, tile, blank, npos):
+    """Change in manhattan_linear_conflict when ``tile`` slides from ``npos``
+    into ``blank``, turning ``state`` into ``neighbor``."""
+    delta = MANHATTAN[tile][blank] - MANHATTAN[tile][npos]
+    for line in AFFECTED_LINES[blank][npos]:
+        cells = LINE_CELLS[line]
+        conflicts = LINE_CONFLICTS[line]
+        delta += conflicts[_line_key(neighbor, cells)] - conflicts[_line_key(state, cells)]
+    return delta
+
+
+# Heuristic objects give solvers a full estimate for the start board and an
+# O(1) update for each slide, so the value can travel with the node:
+#   h(neighbor) == update(h(state), state, neighbor, tile, blank, npos)
+# where `tile` slid from cell `npos` into the blank at cell `blank`.
+# `integral` says whether every estimate is an int, which lets A* use a
+# bucket queue (algorithms.open_list) instead of a heap.
+
+class TileDistanceHeuristic:
+    """Sum of independent per-tile distances; a slide changes one term."""
+
+    def __init__(self, table):
+        self.table = table
+        self.integral = all(isinstance(cost, int) for costs in table for cost in costs)
+
+    def estimate(self, state):
+        table = self.table
+        return sum(table[(state >> SHIFTS[pos]) & CELL_MASK][pos] for pos in range(SIZE))
+
+    def update(self, h, state, neighbor, tile, blank, npos):
+        costs = self.table[tile]
+        return h + costs[blank] - costs[npos]
+
+
+class LinearConflictHeuristic:
+    """Manhattan distance plus linear conflicts."""
+
+    integral = True
+
+    def estimate(self, state):
+        return manhattan_linear_conflict(state)
+
+    def update(self, h, state, neighbor, tile, blank, npos):
+        return h + manhattan_linear_conflict_delta(state, neighbor, tile, blank, npos)
+
+
+MANHATTAN_HEURISTIC = TileDistanceHeuristic(MANHATTAN)
+EUCLIDEAN_HEURISTIC = TileDistanceHeuristic(EUCLIDEAN)
+LINEAR_CONFLICT_HEURISTIC = LinearConflictHeuristic()
+
+
+# Lines with at most this many possible contents keep a memo of their
+# penalties; longer ones (4-wide on 20 cells and up) compute each lookup
+MEMO_LINE_CONTENTS = 1 << 16
+
+
+class _LineConflicts(dict):
+    """Line penalties of one line keyed like LINE_CONFLICTS, computed on
+    first use: a 5-wide line has 25**5 possible keys, too many to tabulate
+    up front. Values are only kept if the line has few enough possible
+    contents (see MEMO_LINE_CONTENTS), so the memo stays small."""
+
+    def __init__(self, line, length, bits, rows, cols):
+        super().__init__()
+        self.line = line
+        self.length = length
+        self.bits = bits
+        self.rows = rows
+        self.cols = cols
+        self.memoize = math.perm(rows * cols, length) <= MEMO_LINE_CONTENTS
+
+    def __missing__(self, key):
+        mask = (1 << self.bits) - 1
+        tiles = [(key >> (self.bits * (self.length - 1 - k))) & mask for k in range(self.length)]
+        value = _line_penalty(self.line, tiles, self.rows, self.cols)
+        if self.memoize:
+            self[key] = value
+        return value
+
+
+class GridLinearConflictHeuristic:
+    """Manhattan distance plus linear conflicts for any board.Geometry, with
+    the same estimate()/update() interface as LinearConflictHeuristic."""
+
+    integral = True
+
+    def __init__(self, geometry):
+        rows, cols = geometry.rows, geometry.cols
+        self.size = geometry.size
+        self.bits = geometry.bits
+        self.mask = geometry.cell_mask
+        self.shifts = geometry.shifts
+        self.manhattan = _build_tile_table(lambda di, dj: abs(di) + abs(dj), rows, cols)
+        self.line_cells = _build_line_cells(rows, cols)
+        self.conflicts = tuple(
+            _LineConflicts(line, len(cells), geometry.bits, rows, cols)
+            for line, cells in enumerate(self.line_cells)
+        )
+        # A slide only changes the conflicts of a line if the moved tile's
+        # goal is in that line: its goal column for a horizontal slide (the
+        # tile changes column), its goal row for a vertical one.
+        self.goal_lines = tuple((tile // cols, rows + tile % cols) for tile in range(self.size))
+        self.slide_axis = tuple(
+            tuple(int(blank // cols == npos // cols) for npos in range(self.size))
+            for blank in range(self.size)
+        )
+        self.affected_lines = _build_affected_lines(rows, cols)
+
+    def _line_key(self, state, cells):
+        key = 0
+        for pos in cells:
+            key = (key << self.bits) | ((state >> self.shifts[pos]) & self.mask)
+        return key
+
+    def estimate(self, state):
+        manhattan = self.manhattan
+        h = sum(
+            manhattan[(state >> self.shifts[pos]) & self.mask][pos] for pos in range(self.size)
+        )
+        for line, cells in enumerate(self.line_cells):
+            h += self.conflicts[line][self._line_key(state, cells)]
+        return h
+
+    def update(self, h, state, neighbor, tile, blank, npos):
+        costs = self.manhattan[tile]
+        h += costs[blank] - costs[npos]
+        line = self.goal_lines[tile][self.slide_axis[blank][npos]]
+        if line in self.affected_lines[blank][npos]:
+            cells = self.line_cells[line]
+            conflicts = self.conflicts[line]
+            h += conflicts[self._line_key(neighbor, cells)] - conflicts[self._line_key(state, cells)]
+        return h
+
+
+@lru_cache(maxsize=None)
+def get_linear_conflict_heuristic(geometry):
+    """Manhattan + linear conflict heuristic object for a board shape."""
+    if geometry is BOARD_3X3:
+        return LINEAR_CONFLICT_HEURISTIC
+    return GridLinearConflictHeuristic(geometry)
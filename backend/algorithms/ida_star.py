@@ -0,0 +1,236 @@
+import time
+
+from algorithms.budget import Budget, run_within_budget
+from algorithms.board import geometry_of
+from algorithms.grid_pattern_database import GROUP_SHIFTS, KEY_MASK, TILE_GROUP, inverse_board, tile_shift
+from algorithms.heuristics import get_linear_conflict_heuristic
+
+FOUND = -1
+
+# Shift of each tile's field in a 4x4 inverse board
+TILE_SHIFTS_4X4 = (None,) + tuple(tile_shift(tile) for tile in range(1, 16))
+
+
+class IDAStar:
+    """IDA* with Manhattan distance plus linear conflicts. Unlike the other
+    solvers it works on any rows x cols board; the shape is taken from
+    ``start``.
+
+    On 4x4 boards, passing the 5-5-5 ``pattern_database`` (a
+    grid_pattern_database.PatternDatabase15) makes it the heuristic instead."""
+
+    def __init__(self, start, budget=None, pattern_database=None):
+        self.geometry = geometry_of(start)
+        self.lc_heuristic = get_linear_conflict_heuristic(self.geometry)
+        if pattern_database is not None and (self.geometry.rows, self.geometry.cols) != (4, 4):
+            raise ValueError("the pattern database heuristic is for 4x4 boards")
+        self.pattern_database = pattern_database
+        self.start = self.geometry.encode(start)
+        self.Goal = self.geometry.goal
+        self.budget = budget or Budget()
+        self.check_at = 0
+
+        self.path = []
+        self.moves = []
+        self.expanded = 0
+        self.max_depth = 0
+        self.runtime = 0.0
+        self.found = False
+        self.status = None
+        self.profile = None
+
+    def get_neighbors(self, state):
+        return self.geometry.neighbors(state)
+
+    def heuristic(self, state):
+        return self.lc_heuristic.estimate(state)
+
+    def search(self, state, g, h, bound, previous_blank):
+        """Cost-bounded DFS. Returns FOUND, or the smallest f that exceeded
+        the bound. The heuristic is carried down and updated per move."""
+        f = g + h
+        if f > bound:
+            return f
+
+        if self.expanded >= self.check_at:
+            self.check_at = self.budget.check(self.expanded, len(self.moves), self.max_depth)
+        self.expanded += 1
+        if g > self.max_depth:
+            self.max_depth = g
+
+        if state == self.Goal:
+            return FOUND
+
+        minimum = None
+        profile = self.profile
+        geometry = self.geometry
+        shifts = geometry.shifts
+        mask = geometry.cell_mask
+        update = self.lc_heuristic.update
+        blank = state & mask
+        for npos, action, tile_factor, blank_offset in geometry.moves[blank]:
+            if npos == previous_blank:
+                continue  # never undo the move that got us here
+            tile = (state >> shifts[npos]) & mask
+            neighbor = state + tile * tile_factor + blank_offset
+            if profile is not None:
+                profile.successors += profile.lap()
+            neighbor_h = update(h, state, neighbor, tile, blank, npos)
+            if profile is not None:
+                profile.heuristic += profile.lap()
+
+            self.path.append(neighbor)
+            self.moves.append(action)
+            if profile is not None:
+                profile.frontier += profile.lap()
+            result = self.search(neighbor, g + 1, neighbor_h, bound, blank)
+            if result == FOUND:
+                return FOUND
+            self.path.pop()
+            self.moves.pop()
+            if profile is not None:
+                profile.frontier += profile.lap()
+
+            if minimum is None or result < minimum:
+                minimum = result
+
+        return minimum
+
+    def search_inverse(self, state, inverse, g, h, bound, previous_blank):
+        """search() with the pattern databases: the inverse board travels
+        with the state, so each slide updates one database lookup."""
+        f = g + h
+        if f > bound:
+            return f
+
+        if self.expanded >= self.check_at:
+            self.check_at = self.budget.check(self.expanded, len(self.moves), self.max_depth)
+        self.expanded += 1
+        if g > self.max_depth:
+            self.max_depth = g
+
+        if state == self.Goal:
+            return FOUND
+
+        minimum = None
+        profile = self.profile
+        geometry = self.geometry
+        shifts = geometry.shifts
+        mask = geometry.cell_mask
+        databases = self.pattern_database.databases
+        blank = state & mask
+        for npos, action, tile_factor, blank_offset in geometry.moves[blank]:
+            if npos == previous_blank:
+                continue  # never undo the move that got us here
+            tile = (state >> shifts[npos]) & mask
+            neighbor = state + tile * tile_factor + blank_offset
+            neighbor_inverse = inverse + ((blank - npos) << TILE_SHIFTS_4X4[tile])
+            if profile is not None:
+                profile.successors += profile.lap()
+            group = TILE_GROUP[tile]
+            database = databases[group]
+            shift = GROUP_SHIFTS[group]
+            neighbor_h = (
+                h - database[(inverse >> shift) & KEY_MASK]
+                + database[(neighbor_inverse >> shift) & KEY_MASK]
+            )
+            if profile is not None:
+                profile.heuristic += profile.lap()
+
+            self.path.append(neighbor)
+            self.moves.append(action)
+            if profile is not None:
+                profile.frontier += profile.lap()
+            result = self.search_inverse(neighbor, neighbor_inverse, g + 1, neighbor_h, bound, blank)
+            if result == FOUND:
+                return FOUND
+            self.path.pop()
+            self.moves.pop()
+            if profile is not None:
+                profile.frontier += profile.lap()
+
+            if minimum is None or result < minimum:
+                minimum = result
+
+        return minimum
+
+    def ida_star(self):
+        start_time = time.perf_counter_ns()
+        self.expanded = 0
+        self.max_depth = 0
+        self.path = [self.start]
+        self.moves = []
+
+        # IDA* never terminates on an unsolvable board, so reject it up front
+        if not self.geometry.is_solvable(self.start):
+            self.path = []
+            self.found = False
+            self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+            return
+
+        if self.pattern_database is not None:
+            inverse = inverse_board(self.start)
+            h = self.pattern_database.estimate_inverse(inverse)
+
+            def search(bound):
+                return self.search_inverse(self.start, inverse, 0, h, bound, None)
+        else:
+            h = self.heuristic(self.start)
+
+            def search(bound):
+                return self.search(self.start, 0, h, bound, None)
+
+        bound = h
+        while True:
+            result = search(bound)
+            if result == FOUND:
+                self.found = True
+                break
+            if result is None:
+                self.path = []
+                self.found = False
+                break
+            bound = result
+
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+
+    def run(self):
+        run_within_budget(self, self.ida_star)
+
+    def get_path(self):
+        return [self.geometry.decode(state) for state in self.path]
+
+    def get_moves(self):
+        return self.moves
+
+    def get_cost(self):
+        return len(self.moves)
+
+    def get_expanded(self):
+        return self.expanded
+
+    def get_runtime(self):
+        return self.runtime
+
+    def get_depth(self):
+        return self.max_depth
+
+
+if __name__ == "__main__":
+    start_state = [
+        [8, 6, 7],
+        [2, 5, 4],
+        [3, 0, 1]
+    ]
+
+    solver = IDAStar(start_state)
+    solver.run()
+    print("=== IDA* Results ===")
+    print("Solution found:", solver.found)
+    print("Path length:", len(solver.get_path()))
+    print("Cost:", solver.get_cost())
+    print("Nodes expanded:", solver.get_expanded())
+    print("Max depth reached:", solver.get_depth())
+    print("Runtime:", solver.get_runtime(), "seconds")
+    if solver.found:
+        print("Moves:", solver.get_moves())
@@ -1,13 +1,15 @@
 import time
 
+from algorithms.board import GOAL, MAX_SOLUTION_LENGTH, encode, decode, neighbors
+from algorithms.budget import Budget, run_within_budget
+from algorithms.permutation import is_reachable
+
 class IDS:
-    def __init__(self, start):
-        self.start = self.state_to_tuple(start)
-        self.Goal = (
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8)
-        )
+    def __init__(self, start, budget=None):
+        self.start = encode(start)
+        self.Goal = GOAL
+        self.budget = budget or Budget()
+        self.check_at = 0
 
         self.path = []
         self.moves = []
@@ -15,85 +17,88 @@ class IDS:
         self.max_depth = 0
         self.runtime = 0.0
         self.found = False
+        self.status = None
+        self.profile = None
     
-    def state_to_tuple(self, state):
-        return tuple(tuple(row) for row in state)
-    
-    def tuple_to_list(self, state_tuple):
-        return [list(row) for row in state_tuple]
-
-    def find_zero(self, state):
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == 0:
-                    return i, j
-
     def get_neighbors(self, state):
-        neighbors = []
-        i, j = self.find_zero(state)
-        directions = [
-            (-1, 0, "Up"),
-            (0, -1, "Left"),
-            (1, 0, "Down"),
-            (0, 1, "Right")
-        ]
-        for di, dj, action in directions:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < 3 and 0 <= nj < 3:
-                new_state = [list(row) for row in state]
-                new_state[i][j], new_state[ni][nj] = new_state[ni][nj], new_state[i][j]
-                neighbors.append((self.state_to_tuple(new_state), action))
-        return neighbors
+        return neighbors(state)
 
     def dls(self, state, depth, path, moves, visited):
         if depth == 0:
-            return None
+            return False
         
+        if self.expanded >= self.check_at:
+            self.check_at = self.budget.check(self.expanded, len(moves), self.max_depth)
         self.expanded += 1
         current_depth = len(moves)
         if current_depth > self.max_depth:
             self.max_depth = current_depth
 
         if state == self.Goal:
-            return path, moves
+            return True
 
-        for neighbor, action in self.get_neighbors(state):
+        # path/moves are shared by the whole descent and undone on backtrack
+        profile = self.profile
+        successors = neighbors(state)
+        if profile is not None:
+            profile.successors += profile.lap()
+        for neighbor, action in successors:
             if neighbor not in visited:
                 visited.add(neighbor)
-                result = self.dls(neighbor, depth - 1, path + [neighbor], moves + [action], visited)
-                if result is not None:
-                    return result
+                if profile is not None:
+                    profile.visited += profile.lap()
+                path.append(neighbor)
+                moves.append(action)
+                if profile is not None:
+                    profile.frontier += profile.lap()
+                if self.dls(neighbor, depth - 1, path, moves, visited):
+                    return True
+                path.pop()
+                moves.pop()
+                if profile is not None:
+                    profile.frontier += profile.lap()
                 visited.remove(neighbor)
+        if profile is not None:
+            profile.visited += profile.lap()
         
-        return None
+        return False
 
     def iddfs(self):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         depth = 0
+
+        # Deepening past the longest possible solution only re-searches the
+        # same tree, and no depth limit ever reaches an unsolvable goal
+        if not is_reachable(self.start):
+            self.found = False
+            self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+            return
         
-        while depth <= 50:  # Maximum depth limit
-            self.expanded = 0
+        # dls(depth) tries paths of up to depth - 1 moves. expanded counts
+        # every iteration, like the budget does.
+        self.expanded = 0
+        while depth <= MAX_SOLUTION_LENGTH + 1:
             self.max_depth = 0
             visited = set([self.start])
+            path = [self.start]
+            moves = []
             
-            result = self.dls(self.start, depth, [self.start], [], visited)
-            
-            if result is not None:
-                self.path, self.moves = result
+            if self.dls(self.start, depth, path, moves, visited):
+                self.path, self.moves = path, moves
                 self.found = True
-                self.runtime = time.time() - start_time
+                self.runtime = (time.perf_counter_ns() - start_time) / 1e9
                 return
                 
             depth += 1
 
-        self.runtime = time.time() - start_time
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
         self.found = False
 
     def run(self):
-        self.iddfs()
+        run_within_budget(self, self.iddfs)
         
     def get_path(self):
-        return [self.tuple_to_list(state) for state in self.path]
+        return [decode(state) for state in self.path]
     
     def get_moves(self):
         return self.moves
@@ -0,0 +1,20 @@
+"""The optional NumPy dependency in one place.
+
+Modules with NumPy code paths import ``np`` from here; it is None when NumPy
+is not installed, ``available()`` tells callers whether those paths can run,
+and ``require`` raises a uniform ImportError from the ones that cannot.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+def available():
+    return np is not None
+
+
+def require(feature):
+    if np is None:
+        raise ImportError(f"{feature} needs numpy (pip install numpy)")
@@ -0,0 +1,88 @@
+"""Open lists for A*.
+
+Both queues hold entries pushed with ``push(f, g, entry)`` and hand back
+the entry itself from ``pop()``, so the search loop does not care which
+one it has:
+
+``HeapQueue``   a heapq over the entries, which must be tuples starting
+                with (f, g, ...); works for any f, including floats.
+``BucketQueue`` one stack per (f, g) pair for integer f. Pops come from the
+                lowest f, then the highest g, newest first: deeper nodes
+                of equal f are closer to a goal, so A* reaches it sooner.
+                Push and pop are O(1) amortised, and no tuples are compared.
+"""
+
+import heapq
+
+
+class HeapQueue:
+    def __init__(self):
+        self.heap = []
+
+    def push(self, f, g, entry):
+        heapq.heappush(self.heap, entry)
+
+    def pop(self):
+        return heapq.heappop(self.heap)
+
+    def min_f(self):
+        return self.heap[0][0]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class BucketQueue:
+    """Bucket queue for non-negative integer f with 0 <= g <= f, which
+    holds whenever the heuristic is non-negative."""
+
+    def __init__(self):
+        # buckets[f][g] is a stack of entries; tops[f] is an upper bound on
+        # the highest non-empty g of buckets[f], or -1
+        self.buckets = []
+        self.tops = []
+        self.lowest = 0
+        self.size = 0
+
+    def push(self, f, g, entry):
+        if f >= len(self.buckets):
+            for new_f in range(len(self.buckets), f + 1):
+                self.buckets.append([[] for _ in range(new_f + 1)])
+                self.tops.append(-1)
+        self.buckets[f][g].append(entry)
+        if g > self.tops[f]:
+            self.tops[f] = g
+        if f < self.lowest:
+            self.lowest = f
+        self.size += 1
+
+    def _settle(self):
+        # Move lowest/tops[lowest] onto the next entry to pop
+        buckets = self.buckets
+        tops = self.tops
+        f = self.lowest
+        while True:
+            by_g = buckets[f]
+            g = tops[f]
+            while g >= 0 and not by_g[g]:
+                g -= 1
+            tops[f] = g
+            if g >= 0:
+                self.lowest = f
+                return f, g
+            f += 1
+
+    def pop(self):
+        if not self.size:
+            raise IndexError("pop from an empty BucketQueue")
+        f, g = self._settle()
+        self.size -= 1
+        return self.buckets[f][g].pop()
+
+    def min_f(self):
+        if not self.size:
+            raise IndexError("min_f of an empty BucketQueue")
+        return self._settle()[0]
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,169 @@
+"""Additive disjoint pattern databases for the 8-puzzle.
+
+Each database covers a group of tiles and stores, for every placement of
+those tiles, the fewest moves *of those tiles* needed to bring them home
+(moves of other tiles are free). Because the groups are disjoint and only
+their own moves are counted, the lookups can be summed and stay admissible.
+
+The databases are built once per process on first use and shared by every
+solver.
+"""
+
+from collections import deque
+import threading
+
+from algorithms.board import BITS, CELL_MASK, COLS, ROWS, SHIFTS, SIZE
+
+PATTERNS = ((1, 2, 3, 4), (5, 6, 7, 8))
+
+UNREACHED = 0xFF
+
+
+def _neighbors(pos):
+    i, j = divmod(pos, COLS)
+    result = []
+    for di, dj in ((-1, 0), (0, -1), (1, 0), (0, 1)):
+        ni, nj = i + di, j + dj
+        if 0 <= ni < ROWS and 0 <= nj < COLS:
+            result.append(ni * COLS + nj)
+    return result
+
+
+NEIGHBOR_CELLS = tuple(tuple(_neighbors(pos)) for pos in range(SIZE))
+
+
+def placement_key(positions):
+    key = 0
+    for pos in positions:
+        key = key * SIZE + pos
+    return key
+
+
+def build_pattern_database(pattern):
+    """0-1 BFS over (pattern tile cells, blank cell) from the goal layout.
+
+    Returns a bytearray indexed by placement_key(cells of the pattern tiles)
+    holding the minimum over blank positions.
+    """
+    tiles = len(pattern)
+    database = bytearray([UNREACHED]) * (SIZE ** tiles)
+    # Abstract states are (cells..., blank); the distance array is keyed the
+    # same way with the blank as the last base-SIZE digit.
+    distances = bytearray([UNREACHED]) * (SIZE ** (tiles + 1))
+    start = tuple(pattern) + (0,)
+    distances[placement_key(start)] = 0
+    queue = deque([(start, 0)])
+
+    while queue:
+        state, distance = queue.popleft()
+        if distance > distances[placement_key(state)]:
+            continue
+        cells, blank = state[:tiles], state[tiles]
+        key = placement_key(cells)
+        if distance < database[key]:
+            database[key] = distance
+        for npos in NEIGHBOR_CELLS[blank]:
+            if npos in cells:
+                # A pattern tile slides into the blank: costs one move
+                moved = tuple(blank if pos == npos else pos for pos in cells)
+                neighbor = moved + (npos,)
+                cost = distance + 1
+            else:
+                neighbor = cells + (npos,)
+                cost = distance
+            neighbor_key = placement_key(neighbor)
+            if cost < distances[neighbor_key]:
+                distances[neighbor_key] = cost
+                if cost == distance:
+                    queue.appendleft((neighbor, cost))
+                else:
+                    queue.append((neighbor, cost))
+
+    return database
+
+
+_databases = None
+_databases_lock = threading.Lock()
+
+
+def get_pattern_databases():
+    global _databases
+    if _databases is None:
+        with _databases_lock:
+            if _databases is None:
+                _databases = tuple(build_pattern_database(pattern) for pattern in PATTERNS)
+    return _databases
+
+
+def _build_tile_groups():
+    # TILE_GROUP[tile] -> (index of its pattern, index within the pattern)
+    groups = [None] * SIZE
+    for group, pattern in enumerate(PATTERNS):
+        for k, tile in enumerate(pattern):
+            groups[tile] = (group, k)
+    return tuple(groups)
+
+
+TILE_GROUP = _build_tile_groups()
+# placement_key weight of the k-th tile of a pattern
+KEY_WEIGHTS = tuple(tuple(SIZE ** (len(pattern) - 1 - k) for k in range(len(pattern))) for pattern in PATTERNS)
+
+# A board row is COLS cells of BITS bits each, contiguous in the packed int.
+# ROW_KEYS[group][row][bits of that row] is what the row adds to the group's
+# placement_key, so a group's key is COLS lookups whatever the board holds.
+ROW_SHIFTS = tuple(SHIFTS[row * COLS + COLS - 1] for row in range(ROWS))
+ROW_MASK = (1 << (BITS * COLS)) - 1
+
+
+def _build_row_keys(group):
+    tables = []
+    for row in range(ROWS):
+        table = [0] * (ROW_MASK + 1)
+        for bits in range(ROW_MASK + 1):
+            for j in range(COLS):
+                tile = (bits >> (BITS * (COLS - 1 - j))) & CELL_MASK
+                if tile < SIZE and TILE_GROUP[tile] is not None and TILE_GROUP[tile][0] == group:
+                    table[bits] += (row * COLS + j) * KEY_WEIGHTS[group][TILE_GROUP[tile][1]]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+ROW_KEYS = tuple(_build_row_keys(group) for group in range(len(PATTERNS)))
+
+
+_TOP, _MIDDLE, _BOTTOM = ROW_SHIFTS
+
+
+def group_key(state, group):
+    """placement_key of the cells that group's tiles occupy in state."""
+    top, middle, bottom = ROW_KEYS[group]
+    return (
+        top[(state >> _TOP) & ROW_MASK]
+        + middle[(state >> _MIDDLE) & ROW_MASK]
+        + bottom[(state >> _BOTTOM) & ROW_MASK]
+    )
+
+
+def pattern_database_heuristic(state):
+    databases = get_pattern_databases()
+    return sum(database[group_key(state, group)] for group, database in enumerate(databases))
+
+
+class PatternDatabaseHeuristic:
+    """Sum of the pattern database lookups; a slide only changes the term
+    of the group the moved tile belongs to, and that group's key moves by
+    the tile's weight times the distance it slid."""
+
+    integral = True
+
+    def estimate(self, state):
+        return pattern_database_heuristic(state)
+
+    def update(self, h, state, neighbor, tile, blank, npos):
+        group, k = TILE_GROUP[tile]
+        database = get_pattern_databases()[group]
+        key = group_key(state, group)
+        return h - database[key] + database[key + (blank - npos) * KEY_WEIGHTS[group][k]]
+
+
+PATTERN_DATABASE_HEURISTIC = PatternDatabaseHeuristic()
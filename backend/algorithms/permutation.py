@@ -0,0 +1,189 @@
+"""Dense integer indexing of 8-puzzle boards.
+
+``state_rank`` maps every arrangement of the nine cells to a distinct int in
+[0, 9!): the blank position selects a block of 8! ranks and the Lehmer code
+of the eight tiles (read row-major, skipping the blank) picks the slot inside
+it. With that split a horizontal blank move never changes the tile order and
+a vertical one only rotates three neighbouring tiles, so ``rank_after_move``
+updates a rank in constant time instead of re-ranking the board.
+
+``reachable_index`` further halves the space to the 9!/2 boards that can reach
+the goal, and ``BitSet`` gives closed sets one bit per rank.
+"""
+
+from algorithms.board import ACTIONS, CELL_MASK, INVERSE_CODES, MOVES_BY_CODE, SHIFTS, SIZE
+
+TILES = SIZE - 1
+
+
+def _factorials(n):
+    result = [1]
+    for i in range(1, n + 1):
+        result.append(result[-1] * i)
+    return tuple(result)
+
+
+FACTORIALS = _factorials(SIZE)
+TILE_PERMUTATIONS = FACTORIALS[TILES]          # 8!
+STATE_COUNT = FACTORIALS[SIZE]                 # 9!
+REACHABLE_COUNT = STATE_COUNT // 2             # 9!/2
+HALF_TILE_PERMUTATIONS = TILE_PERMUTATIONS // 2
+
+# Weight of the Lehmer digit at each index of the tile sequence
+_WEIGHTS = tuple(FACTORIALS[TILES - 1 - k] for k in range(TILES))
+
+
+def unrank(index, n):
+    """The permutation of 0..n-1 whose Lehmer code (lexicographic rank) is
+    ``index``."""
+    remaining = list(range(n))
+    perm = []
+    for k in range(n - 1, -1, -1):
+        digit, index = divmod(index, FACTORIALS[k])
+        perm.append(remaining.pop(digit))
+    return perm
+
+
+def _tile_rank(packed):
+    # Returns (Lehmer rank of the tile order, inversion count)
+    result = 0
+    inversions = 0
+    seen = 0
+    k = 0
+    for shift in SHIFTS:
+        tile = (packed >> shift) & CELL_MASK
+        if tile:
+            digit = tile - 1 - bin(seen & ((1 << tile) - 1)).count("1")
+            result += digit * _WEIGHTS[k]
+            inversions += digit
+            seen |= 1 << tile
+            k += 1
+    return result, inversions
+
+
+def state_rank(packed):
+    """Map a packed board to a distinct int in [0, 9!)."""
+    return (packed & CELL_MASK) * TILE_PERMUTATIONS + _tile_rank(packed)[0]
+
+
+def state_unrank(index):
+    """Inverse of ``state_rank``: rebuild the packed board."""
+    blank, tile_index = divmod(index, TILE_PERMUTATIONS)
+    tiles = unrank(tile_index, TILES)
+    packed = blank
+    k = 0
+    for pos in range(SIZE):
+        if pos != blank:
+            packed |= (tiles[k] + 1) << SHIFTS[pos]
+            k += 1
+    return packed
+
+
+def rank_after_move(index, packed, npos):
+    """Rank of the board reached by sliding the tile at ``npos`` into the
+    blank of ``packed``, given ``index == state_rank(packed)``.
+
+    Horizontal moves keep the tile order, so only the blank block changes.
+    A vertical move carries one tile past the two tiles between its old and
+    new cells, which rewrites just those three Lehmer digits.
+    """
+    blank = packed & CELL_MASK
+    index += (npos - blank) * TILE_PERMUTATIONS
+    if npos - blank in (1, -1):
+        return index
+
+    if npos > blank:
+        # Tile t jumps from sequence slot p+2 to p: [x, y, t] -> [t, x, y]
+        p = blank
+        x = (packed >> SHIFTS[blank + 1]) & CELL_MASK
+        y = (packed >> SHIFTS[blank + 2]) & CELL_MASK
+        t = (packed >> SHIFTS[npos]) & CELL_MASK
+        w0, w1, w2 = _WEIGHTS[p], _WEIGHTS[p + 1], _WEIGHTS[p + 2]
+        d0 = (index // w0) % (TILES - p)
+        d1 = (index // w1) % (TILES - p - 1)
+        d2 = (index // w2) % (TILES - p - 2)
+        n0 = (x < t) + (y < t) + d2
+        n1 = d0 - (t < x)
+        n2 = d1 - (t < y)
+    else:
+        # Tile t jumps from sequence slot p to p+2: [t, x, y] -> [x, y, t]
+        p = npos
+        t = (packed >> SHIFTS[npos]) & CELL_MASK
+        x = (packed >> SHIFTS[npos + 1]) & CELL_MASK
+        y = (packed >> SHIFTS[npos + 2]) & CELL_MASK
+        w0, w1, w2 = _WEIGHTS[p], _WEIGHTS[p + 1], _WEIGHTS[p + 2]
+        d0 = (index // w0) % (TILES - p)
+        d1 = (index // w1) % (TILES - p - 1)
+        d2 = (index // w2) % (TILES - p - 2)
+        n0 = d1 + (t < x)
+        n1 = d2 + (t < y)
+        n2 = d0 - (x < t) - (y < t)
+
+    return index + (n0 - d0) * w0 + (n1 - d1) * w1 + (n2 - d2) * w2
+
+
+def reachable_index(packed):
+    """Map a board to a slot in [0, 9!/2), or None if it cannot reach the goal.
+
+    Tile ranks 2k and 2k+1 differ only by a swap of the last two tiles, so
+    exactly one of them has the even inversion count a solvable 3x3 board
+    needs and rank // 2 is dense over reachable boards.
+    """
+    tile_index, inversions = _tile_rank(packed)
+    if inversions & 1:
+        return None
+    return (packed & CELL_MASK) * HALF_TILE_PERMUTATIONS + (tile_index >> 1)
+
+
+def reconstruct_coded_path(codes, state, start):
+    """Rebuild (path, moves) ending at ``state`` when ``codes[state_rank(s)]``
+    holds the action code of the move that first reached each state."""
+    path = [state]
+    moves = []
+    while state != start:
+        code = codes[state_rank(state)]
+        npos, _, tile_factor, blank_offset = MOVES_BY_CODE[state & CELL_MASK][INVERSE_CODES[code]]
+        tile = (state >> SHIFTS[npos]) & CELL_MASK
+        state = state + tile * tile_factor + blank_offset
+        path.append(state)
+        moves.append(ACTIONS[code])
+    path.reverse()
+    moves.reverse()
+    return path, moves
+
+
+def is_reachable(packed):
+    return not _tile_rank(packed)[1] & 1
+
+
+class BitSet:
+    """Fixed-size set of non-negative ints, one bit each."""
+
+    def __init__(self, size):
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+
+    def add(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, index):
+        return self.bits[index >> 3] >> (index & 7) & 1 == 1
+
+    def __len__(self):
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+
+class PackedCodes:
+    """Fixed-size array of 2-bit move codes, four per byte."""
+
+    def __init__(self, size):
+        self.size = size
+        self.bits = bytearray((size + 3) >> 2)
+
+    def __getitem__(self, index):
+        return (self.bits[index >> 2] >> ((index & 3) << 1)) & 3
+
+    def __setitem__(self, index, code):
+        shift = (index & 3) << 1
+        byte = index >> 2
+        self.bits[byte] = (self.bits[byte] & ~(3 << shift)) | (code << shift)
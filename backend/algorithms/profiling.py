@@ -0,0 +1,50 @@
+"""Optional per-phase timing for the solver loops.
+
+A solver's ``profile`` attribute is None unless a caller sets it to a
+``Profile`` before run(). The loops then call ``lap()`` at each phase
+boundary and charge the nanoseconds since the previous boundary to the
+phase that ends there, so one clock read serves two phases and small
+bookkeeping (goal tests, depth counters) is folded into a neighbouring
+phase. With profiling off, a boundary costs a single ``is not None`` test.
+
+Phases:
+    successors  computing the successor boards (and their ranks)
+    heuristic   scoring successors
+    frontier    pushing to and popping from the open list/queue/stack
+    visited     looking up and recording seen states / best g
+Setup before the loop and path reconstruction after it show up as
+``other``. Reading the clock costs tens of nanoseconds, so a profiled run is
+slower than a plain one; compare phases with each other, not with runtimes
+of unprofiled runs.
+"""
+
+import time
+
+PHASES = ("successors", "heuristic", "frontier", "visited")
+
+
+class Profile:
+    __slots__ = PHASES + ("mark", "started")
+
+    def __init__(self):
+        for phase in PHASES:
+            setattr(self, phase, 0)
+        self.mark = self.started = 0
+
+    def start(self):
+        self.mark = self.started = time.perf_counter_ns()
+
+    def lap(self):
+        """Return the nanoseconds since the previous lap (or start)."""
+        now = time.perf_counter_ns()
+        elapsed = now - self.mark
+        self.mark = now
+        return elapsed
+
+    def to_dict(self, total_ns=None):
+        if total_ns is None:
+            total_ns = self.mark - self.started
+        result = {f"{phase}_ms": getattr(self, phase) / 1e6 for phase in PHASES}
+        result["other_ms"] = max(0, total_ns - sum(getattr(self, phase) for phase in PHASES)) / 1e6
+        result["total_ms"] = total_ns / 1e6
+        return result
@@ -0,0 +1,40 @@
+"""Transpose symmetry of the 8-puzzle.
+
+Reflecting a board in its main diagonal and relabelling every tile with the
+tile that sits in the mirrored goal cell maps the goal (blank top-left,
+tiles in row-major order) onto itself. A board and its transpose therefore
+have mirrored solutions with the same cost: each blank move Up becomes Left
+and each Down becomes Right, and vice versa.
+
+``canonicalize`` picks one representative per symmetry class, so caches only
+store one of the two boards, and ``transpose_result`` maps a solution of the
+representative back onto the board that was asked for.
+"""
+
+MIRRORED_MOVES = {"Up": "Left", "Left": "Up", "Down": "Right", "Right": "Down"}
+
+
+def transpose_board(grid):
+    """Mirror a square grid in its diagonal and relabel tiles to match."""
+    size = len(grid)
+    relabel = [None] * (size * size)
+    for i in range(size):
+        for j in range(size):
+            relabel[i * size + j] = j * size + i
+    return [[relabel[grid[j][i]] for j in range(size)] for i in range(size)]
+
+
+def canonicalize(grid):
+    """Return (representative board, whether it is the transpose of grid)."""
+    transposed = transpose_board(grid)
+    if tuple(map(tuple, transposed)) < tuple(map(tuple, grid)):
+        return transposed, True
+    return [list(row) for row in grid], False
+
+
+def transpose_result(result):
+    """Map a result payload for the transposed board back onto the original."""
+    mapped = dict(result)
+    mapped['path'] = [transpose_board(grid) for grid in result['path']]
+    mapped['moves'] = [MIRRORED_MOVES[move] for move in result['moves']]
+    return mapped
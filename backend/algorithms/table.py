@@ -0,0 +1,152 @@
+from collections import deque
+import time
+
+from algorithms.board import (
+    ACTION_CODES, CELL_MASK, GOAL, INVERSE_CODES, MOVES, MOVES_BY_CODE, SHIFTS,
+    decode, encode,
+)
+from algorithms import vector_bfs
+from algorithms.budget import Budget, run_within_budget
+from algorithms.permutation import (
+    HALF_TILE_PERMUTATIONS, REACHABLE_COUNT, TILE_PERMUTATIONS, reachable_index,
+)
+
+# Entry layout: distance << 2 | code of the blank move that gets one step closer
+# Only boards with an even tile permutation are reachable, so the table is
+# indexed by permutation.reachable_index and is 9!/2 = 181,440 bytes.
+TABLE_SIZE = REACHABLE_COUNT
+UNREACHED = 0xFF
+
+
+def build_table(goal=GOAL):
+    """Backward BFS from the goal over the whole reachable state space,
+    with NumPy when it is installed."""
+    if vector_bfs.available():
+        return build_table_vectorized(goal)
+    return build_table_python(goal)
+
+
+def build_table_vectorized(goal=GOAL):
+    """build_table one BFS layer at a time with algorithms.vector_bfs; the
+    table is byte-for-byte the same as build_table_python's."""
+    np = vector_bfs.np
+    inverse = np.array(INVERSE_CODES, dtype=np.uint8)
+    table = np.full(TABLE_SIZE, UNREACHED, dtype=np.uint8)
+    for distance, (ranks, _, _, codes) in enumerate(vector_bfs.layers(goal)):
+        # permutation.reachable_index, computed from the ranks
+        blanks, tile_ranks = np.divmod(ranks, TILE_PERMUTATIONS)
+        index = blanks * HALF_TILE_PERMUTATIONS + (tile_ranks >> 1)
+        table[index] = (distance << 2) | inverse[codes] if distance else 0
+    return bytearray(table.tobytes())
+
+
+def build_table_python(goal=GOAL):
+    table = bytearray([UNREACHED]) * TABLE_SIZE
+    table[reachable_index(goal)] = 0
+    queue = deque([(goal, 0)])
+
+    while queue:
+        state, distance = queue.popleft()
+        entry = (distance + 1) << 2
+        for npos, action, tile_factor, blank_offset in MOVES[state & CELL_MASK]:
+            tile = (state >> SHIFTS[npos]) & CELL_MASK
+            neighbor = state + tile * tile_factor + blank_offset
+            index = reachable_index(neighbor)
+            if table[index] == UNREACHED:
+                # From neighbor, undoing `action` leads back towards the goal
+                table[index] = entry | INVERSE_CODES[ACTION_CODES[action]]
+                queue.append((neighbor, distance + 1))
+
+    return table
+
+
+class TableSolver:
+    def __init__(self, start, table, budget=None):
+        self.start = encode(start)
+        self.table = table
+        # The walk is at most 31 lookups, so the budget is only checked once
+        self.budget = budget or Budget()
+        self.check_at = 0
+
+        self.path = []
+        self.moves = []
+        self.expanded = 0
+        self.max_depth = 0
+        self.runtime = 0.0
+        self.found = False
+        self.status = None
+        self.profile = None
+
+    def lookup(self):
+        start_time = time.perf_counter_ns()
+        table = self.table
+        state = self.start
+        index = reachable_index(state)
+        self.budget.check(0)
+        self.expanded = 1
+
+        if index is None or table[index] == UNREACHED:
+            self.found = False
+            self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+            return
+
+        entry = table[index]
+        path = [state]
+        moves = []
+        while entry >> 2:
+            npos, action, tile_factor, blank_offset = MOVES_BY_CODE[state & CELL_MASK][entry & 3]
+            tile = (state >> SHIFTS[npos]) & CELL_MASK
+            state = state + tile * tile_factor + blank_offset
+            path.append(state)
+            moves.append(action)
+            entry = table[reachable_index(state)]
+            self.expanded += 1
+
+        self.path = path
+        self.moves = moves
+        self.max_depth = len(moves)
+        self.found = True
+        self.runtime = (time.perf_counter_ns() - start_time) / 1e9
+
+    def run(self):
+        run_within_budget(self, self.lookup)
+
+    def get_path(self):
+        return [decode(state) for state in self.path]
+
+    def get_moves(self):
+        return self.moves
+
+    def get_cost(self):
+        return len(self.moves)
+
+    def get_expanded(self):
+        return self.expanded
+
+    def get_runtime(self):
+        return self.runtime
+
+    def get_depth(self):
+        return self.max_depth
+
+
+if __name__ == "__main__":
+    start_state = [
+        [1, 2, 5],
+        [3, 4, 0],
+        [6, 7, 8]
+    ]
+
+    build_start = time.time()
+    table = build_table()
+    print("Table built in", time.time() - build_start, "seconds")
+
+    solver = TableSolver(start_state, table)
+    solver.run()
+    print("=== Table Lookup Results ===")
+    print("Solution found:", solver.found)
+    print("Path length:", len(solver.get_path()))
+    print("Cost:", solver.get_cost())
+    print("Runtime:", solver.get_runtime(), "seconds")
+    if solver.found:
+        print("Moves:", solver.get_moves())
@@ -0,0 +1,74 @@
+"""On-disk format for the distance table built by ``table.build_table``.
+
+Layout (little-endian)::
+
+    magic     4s   b"P8DT"
+    version   u16  FORMAT_VERSION
+    header    u16  header size in bytes (32)
+    goal      9s   goal tile for each cell, row-major
+    (pad)     3x
+    entries   u32  number of table bytes that follow
+    crc32     u32  zlib.crc32 of the table bytes
+    (pad)     4x
+    table     entries bytes
+
+Reading and writing go through algorithms.data_file, so workers ``mmap``
+the file read-only and share one page-cached copy.
+"""
+
+import sys
+import struct
+import time
+
+from algorithms import data_file
+from algorithms.board import GOAL, decode
+from algorithms.table import TABLE_SIZE, build_table
+
+MAGIC = b"P8DT"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHH9s3xII4x")
+
+
+def _goal_bytes(goal):
+    return bytes(tile for row in decode(goal) for tile in row)
+
+
+def save_table(path, table, goal=GOAL):
+    """Write the table atomically so readers never see a partial file."""
+    data_file.save(
+        path, HEADER, MAGIC, FORMAT_VERSION, (_goal_bytes(goal), len(table)), table, ".state_table."
+    )
+
+
+def load_table(path, goal=GOAL):
+    """Map a table file read-only and return a memoryview over its entries.
+
+    Raises ValueError if the file is not a valid table for ``goal``.
+    """
+    def check_fields(fields):
+        goal_layout, entries = fields
+        if entries != TABLE_SIZE:
+            return "unexpected table size"
+        if goal_layout != _goal_bytes(goal):
+            return "table was built for a different goal"
+        return None
+
+    return data_file.load(path, HEADER, MAGIC, FORMAT_VERSION, "state table", TABLE_SIZE, check_fields)
+
+
+def open_table(path, goal=GOAL):
+    """Load the table at ``path``, building and writing it first if it is
+    missing or invalid."""
+    try:
+        return load_table(path, goal)
+    except (OSError, ValueError):
+        save_table(path, build_table(goal), goal)
+        return load_table(path, goal)
+
+
+if __name__ == "__main__":
+    # Build the table ahead of deployment: python -m algorithms.table_file state_table.bin
+    output = sys.argv[1] if len(sys.argv) > 1 else "state_table.bin"
+    build_start = time.time()
+    save_table(output, build_table())
+    print("Wrote", output, "in", time.time() - build_start, "seconds")
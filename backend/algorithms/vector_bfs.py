@@ -0,0 +1,99 @@
+"""Level-synchronous breadth-first search over 8-puzzle boards with NumPy.
+
+Each BFS layer is held as arrays: the boards as an (N, 9) uint8 array, their
+blank cells and their ``permutation.state_rank`` ranks. A whole layer is
+expanded at once by gathering the legal moves of every blank from a small
+table and swapping cells with fancy indexing; successor ranks are computed
+from the boards in bulk and deduplicated against a 9!-entry visited map.
+
+Successors are produced parent by parent in move order and a state is
+credited to the first parent that reaches it, exactly like a FIFO queue
+would, so searches and tables built here match the pure-Python ones entry
+for entry.
+
+NumPy is optional; ``available()`` tells whether this module can be used.
+"""
+
+from algorithms.board import CELL_MASK, MOVES_BY_CODE
+from algorithms.batch_heuristics import boards_from_packed
+from algorithms.numpy_support import available, np, require
+from algorithms.permutation import FACTORIALS, STATE_COUNT, TILE_PERMUTATIONS, TILES
+
+
+if np is not None:
+    # LEGAL[blank, code]: whether that blank move exists; TARGET: the cell
+    # the blank moves to (0 where illegal)
+    LEGAL = np.array(
+        [[move is not None for move in by_code] for by_code in MOVES_BY_CODE], dtype=bool
+    )
+    TARGET = np.array(
+        [[0 if move is None else move[0] for move in by_code] for by_code in MOVES_BY_CODE],
+        dtype=np.intp
+    )
+
+
+def ranks_of(boards, blanks):
+    """state_rank of every row of an (N, 9) board array."""
+    # One contiguous row per tile slot, so each comparison below is a
+    # straight pass over N bytes
+    tiles = boards[boards != 0].reshape(len(boards), TILES).T.copy()
+    ranks = blanks.astype(np.int64) * TILE_PERMUTATIONS
+    for k in range(TILES - 1):
+        # Lehmer digit k: how many later tiles are smaller than tile k
+        digit = np.zeros(len(boards), dtype=np.int64)
+        for j in range(k + 1, TILES):
+            digit += tiles[j] < tiles[k]
+        ranks += digit * FACTORIALS[TILES - 1 - k]
+    return ranks
+
+
+def expand(boards, blanks):
+    """Return (successor boards, their blanks, parent row, action code),
+    ordered by parent and then by action code."""
+    parents, codes = np.nonzero(LEGAL[blanks])
+    targets = TARGET[blanks[parents], codes]
+    children = boards[parents]
+    rows = np.arange(len(parents))
+    children[rows, blanks[parents]] = children[rows, targets]
+    children[rows, targets] = 0
+    return children, targets, parents, codes.astype(np.uint8)
+
+
+def _first_unseen(ranks, visited):
+    # Rows whose rank is neither visited nor repeated earlier in the layer
+    unseen = np.flatnonzero(~visited[ranks])
+    _, first = np.unique(ranks[unseen], return_index=True)
+    first.sort()
+    return unseen[first]
+
+
+def layers(start, profile=None):
+    """Yield (ranks, boards, blanks, codes) for each layer of a BFS from the
+    packed board ``start``; ``codes`` holds the action code of the move that
+    first reached each state (0 for the start). The next layer is only
+    computed when asked for, so callers can stop early."""
+    require("vectorized BFS")
+    boards = boards_from_packed([start])
+    blanks = np.array([start & CELL_MASK], dtype=np.intp)
+    ranks = ranks_of(boards, blanks)
+    codes = np.zeros(1, dtype=np.uint8)
+    visited = np.zeros(STATE_COUNT, dtype=bool)
+    visited[ranks] = True
+
+    while len(ranks):
+        yield ranks, boards, blanks, codes
+        if profile is not None:
+            profile.lap()  # time spent by the caller is its own
+        children, child_blanks, _, child_codes = expand(boards, blanks)
+        child_ranks = ranks_of(children, child_blanks)
+        if profile is not None:
+            profile.successors += profile.lap()
+        keep = _first_unseen(child_ranks, visited)
+        ranks = child_ranks[keep]
+        visited[ranks] = True
+        if profile is not None:
+            profile.visited += profile.lap()
+        boards, blanks, codes = children[keep], child_blanks[keep], child_codes[keep]
+        if profile is not None:
+            profile.frontier += profile.lap()
+
@@ -1,84 +1,398 @@
-from flask import Flask, request, jsonify
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from algorithms.dfs import DFS
-from algorithms.bfs import BFS
-from algorithms.ids import IDS
-from algorithms.a_star import AStarM, AStarE
+from algorithms.budget import Budget
+from algorithms.profiling import Profile
+from jobs import ACTIVE, JobManager, JobQueueFull
+from metrics import (
+    CACHE_ENTRIES, CACHE_HIT_RATIO, CACHE_HITS, CACHE_MISSES, ERRORS, IN_FLIGHT, NODES_EXPANDED,
+    REGISTRY, REQUEST_LATENCY, REQUESTS, SOLVE_RESULTS, SOLVE_RUNTIME,
+)
+from solution_cache import SolutionCache
+from solving import (
+    ALGORITHMS, A_STAR_VARIANTS, JOB_MAX_EXPANDED, JOB_TIMEOUT_MS, build_result,
+    cache_result, canonical_request, check_request, compare_heuristics, create_solver, is_complete,
+    metric_label, orient_result, resolve_budget, run_solver_safely,
+)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Results keyed by (algorithm, start state); repeated boards skip the solver
+solution_cache = SolutionCache(int(os.environ.get('SOLUTION_CACHE_SIZE', '1024')))
+
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '10000'))
+MAX_STREAM_BATCH_SIZE = int(os.environ.get('MAX_STREAM_BATCH_SIZE', '100000'))
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '0')) or available_cores()
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '0')) or available_cores()
+MAX_PENDING_JOBS = int(os.environ.get('MAX_PENDING_JOBS', '64'))
+
+# Process pool for /api/run-batch, started on the first batch. Workers are
+# spawned rather than forked because the server process is multi-threaded.
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+def get_batch_pool():
+    global _batch_pool
+    if _batch_pool is None:
+        with _batch_pool_lock:
+            if _batch_pool is None:
+                _batch_pool = ProcessPoolExecutor(
+                    max_workers=BATCH_WORKERS, mp_context=multiprocessing.get_context('spawn')
+                )
+    return _batch_pool
+
 @app.route('/api/algorithms', methods=['GET'])
 def get_algorithms():
     """Return list of available algorithms"""
-    algorithms = [
-        {'value': 'dfs', 'label': 'Depth-First Search (DFS)'},
-        {'value': 'bfs', 'label': 'Breadth-First Search (BFS)'},
-        {'value': 'ids', 'label': 'Iterative DFS (IDS)'},
-        { 'value': 'a_star_m', 'label': 'A* Search using manhattan_distance' },
-        { 'value': 'a_star_e', 'label': 'A* Search using Euclidean Distance' }
-    ]
-    return jsonify(algorithms)
+    return jsonify(ALGORITHMS)
 
-def is_solvable( state):
-    flat = [num for row in state for num in row if num != 0]
-    inv = sum(1 for i in range(len(flat)) for j in range(i+1, len(flat)) if flat[i] > flat[j])
-    return inv % 2 == 0
+def record_solve(algorithm, result):
+    """Feed the payload of a search that actually ran into the metrics"""
+    if 'error' in result:
+        ERRORS.inc(algorithm=algorithm, reason='exception')
+        return
+    SOLVE_RUNTIME.observe(result['runtime'], algorithm=algorithm)
+    NODES_EXPANDED.observe(result['expanded'], algorithm=algorithm)
+    SOLVE_RESULTS.inc(algorithm=algorithm, status=result['status'])
+
+def reject(algorithm, reason):
+    ERRORS.inc(algorithm=metric_label(algorithm), reason=reason)
+
+def solve_cached(algorithm, start_state, budget, on_solver=None, profile=False, goal_state=None):
+    """Solve a validated board through the solution cache.
+
+    ``on_solver`` is called with the solver before it runs, so a job can
+    watch its progress. A ``profile`` request always runs the solver, with
+    phase timing on, and its result is not cached.
+    """
+    # Solve the board against the standard goal; the cache holds one entry
+    # per symmetry class, so only hits need turning back
+    solve_state, cache_state, orientation = canonical_request(algorithm, start_state, goal_state)
+    cache_key = SolutionCache.make_key(algorithm, cache_state)
+    cached = None if profile else solution_cache.get(cache_key)
+    if cached is not None:
+        return orient_result(cached, orientation)
+    solver = create_solver(algorithm, solve_state, budget)
+    if profile:
+        solver.profile = Profile()
+    if on_solver is not None:
+        on_solver(solver)
+    IN_FLIGHT.inc(algorithm=algorithm)
+    try:
+        solver.run()
+    finally:
+        IN_FLIGHT.dec(algorithm=algorithm)
+    result = build_result(solver)
+    record_solve(algorithm, result)
+    # A search cut short by its budget may finish under a larger one
+    if is_complete(result) and not profile:
+        solution_cache.put(cache_key, cache_result(result, orientation))
+    return orient_result(result, orientation, cached=False)
 
 
 @app.route('/api/run-algorithm', methods=['POST'])
 def run_algorithm():
     """Run the specified algorithm on the given puzzle state"""
+    started = time.perf_counter()
+    algorithm = None
     try:
         data = request.get_json()
         algorithm = data.get('algorithm')
         start_state = data.get('start_state')
-        
-        if not algorithm or not start_state:
-            return jsonify({'error': 'Missing algorithm or start_state'}), 400
-        
-        # Validate start_state is a 3x3 grid
-        if len(start_state) != 3 or any(len(row) != 3 for row in start_state):
-            return jsonify({'error': 'Invalid start_state format. Must be 3x3 grid.'}), 400
-        
-        # Initialize the appropriate solver
-        solvable = is_solvable(start_state)
-        if algorithm == 'dfs':
-            if not solvable:
-                return jsonify({'error': 'The provided puzzle state is unsolvable.'}), 400
-            solver = DFS(start_state)
-        elif algorithm == 'bfs':
-            solver = BFS(start_state)
-        elif algorithm == 'ids':
-            solver = IDS(start_state)
-        elif algorithm == 'a_star_m':
-            solver = AStarM(start_state)
-        elif algorithm == 'a_star_e':
-            solver = AStarE(start_state)
-        else:
-            return jsonify({'error': f'Unknown algorithm: {algorithm}'}), 400
-        
-        # Run the algorithm
-        solver.run()
-        
-        # Return results in EXACT format expected by frontend
+        goal_state = data.get('goal_state')
+        REQUESTS.inc(endpoint='run-algorithm', algorithm=metric_label(algorithm))
+
+        reason, error = check_request(algorithm, start_state, goal_state)
+        if not error:
+            max_expanded, timeout_ms, error = resolve_budget(data)
+            reason = 'invalid_request'
+        if error:
+            reject(algorithm, reason)
+            return jsonify({'error': error}), 400
+
+        result = solve_cached(
+            algorithm, start_state, Budget(max_expanded, timeout_ms),
+            profile=bool(data.get('profile')), goal_state=goal_state
+        )
+
+        if data.get('compare_heuristics') and algorithm in A_STAR_VARIANTS:
+            result = dict(result)
+            # The comparison gets what the main solve left of the time budget
+            remaining_ms = None
+            if timeout_ms is not None:
+                remaining_ms = max(0, timeout_ms - (time.perf_counter() - started) * 1000)
+            result['heuristic_comparison'] = compare_heuristics(
+                start_state, max_expanded, remaining_ms, goal_state,
+                solve=lambda name, timeout_ms: solve_cached(
+                    name, start_state, Budget(max_expanded, timeout_ms), goal_state=goal_state
+                )
+            )
+        REQUEST_LATENCY.observe(time.perf_counter() - started, algorithm=algorithm)
+        return jsonify(result)
+
+    except Exception as e:
+        reject(algorithm, 'exception')
+        return jsonify({'error': f'Algorithm execution failed: {str(e)}'}), 500
+
+def stream_batch(algorithm, start_states, max_expanded, timeout_ms, goal_state=None):
+    """Yield one NDJSON line per board as soon as its result is known.
+
+    At most a few tasks per worker are in flight at once, so memory stays
+    flat however long the batch is. Lines carry the input 'index' because
+    they arrive in completion order.
+    """
+    pool = get_batch_pool()
+    window = BATCH_WORKERS * 4
+    # cache key -> [(input index, orientation), ...] for boards being solved;
+    # the first entry is the board actually sent to the pool
+    waiting = {}
+    in_flight = {}
+
+    def line(index, payload):
+        return json.dumps(dict(payload, index=index)) + '\n'
+
+    def finish(done):
+        for future in done:
+            cache_key = in_flight.pop(future)
+            outcome = future.result()
+            IN_FLIGHT.dec(algorithm=algorithm)
+            record_solve(algorithm, outcome)
+            boards = waiting.pop(cache_key)
+            if 'error' in outcome:
+                for index, _ in boards:
+                    yield line(index, outcome)
+                continue
+            cached = cache_result(outcome, boards[0][1])
+            if is_complete(outcome):
+                solution_cache.put(cache_key, cached)
+            for index, orientation in boards:
+                yield line(index, orient_result(cached, orientation))
+
+    # If the client disconnects, the generator is closed at a yield; the
+    # finally clause drops whatever is still outstanding.
+    try:
+        for index, start_state in enumerate(start_states):
+            reason, error = check_request(algorithm, start_state, goal_state)
+            if error:
+                reject(algorithm, reason)
+                yield line(index, {'error': error})
+                continue
+            solve_state, cache_state, orientation = canonical_request(algorithm, start_state, goal_state)
+            cache_key = SolutionCache.make_key(algorithm, cache_state)
+            if cache_key in waiting:
+                waiting[cache_key].append((index, orientation))
+                continue
+            cached = solution_cache.get(cache_key)
+            if cached is not None:
+                yield line(index, orient_result(cached, orientation))
+                continue
+            waiting[cache_key] = [(index, orientation)]
+            future = pool.submit(run_solver_safely, algorithm, solve_state, max_expanded, timeout_ms)
+            in_flight[future] = cache_key
+            IN_FLIGHT.inc(algorithm=algorithm)
+            if len(in_flight) >= window:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from finish(done)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from finish(done)
+    finally:
+        for future in in_flight:
+            future.cancel()
+        IN_FLIGHT.dec(len(in_flight), algorithm=algorithm)
+
+@app.route('/api/run-batch', methods=['POST'])
+def run_batch():
+    """Solve many boards with one algorithm across a process pool.
+
+    Results come back in input order; a bad board gets an {'error': ...}
+    entry instead of failing the whole batch. With "stream": true the
+    response is NDJSON instead, one line per board in completion order.
+    """
+    algorithm = None
+    try:
+        data = request.get_json()
+        algorithm = data.get('algorithm')
+        start_states = data.get('start_states')
+        goal_state = data.get('goal_state')
+        stream = bool(data.get('stream'))
+
+        REQUESTS.inc(endpoint='run-batch', algorithm=metric_label(algorithm))
+
+        if not algorithm or not isinstance(start_states, list) or not start_states:
+            reject(algorithm, 'invalid_request')
+            return jsonify({'error': 'Missing algorithm or start_states'}), 400
+        max_size = MAX_STREAM_BATCH_SIZE if stream else MAX_BATCH_SIZE
+        if len(start_states) > max_size:
+            reject(algorithm, 'batch_too_large')
+            return jsonify({'error': f'Batch too large. At most {max_size} boards per request.'}), 400
+        max_expanded, timeout_ms, error = resolve_budget(data)
+        if error:
+            reject(algorithm, 'invalid_request')
+            return jsonify({'error': error}), 400
+
+        if stream:
+            return Response(
+                stream_batch(algorithm, start_states, max_expanded, timeout_ms, goal_state),
+                mimetype='application/x-ndjson'
+            )
+
+        results = [None] * len(start_states)
+        # cache key -> (board to solve, [(input index, orientation), ...]);
+        # the first entry is the board that is solved
+        pending = {}
+        for index, start_state in enumerate(start_states):
+            reason, error = check_request(algorithm, start_state, goal_state)
+            if error:
+                reject(algorithm, reason)
+                results[index] = {'error': error}
+                continue
+            solve_state, cache_state, orientation = canonical_request(algorithm, start_state, goal_state)
+            cache_key = SolutionCache.make_key(algorithm, cache_state)
+            if cache_key not in pending:
+                cached = solution_cache.get(cache_key)
+                if cached is not None:
+                    results[index] = orient_result(cached, orientation)
+                    continue
+                pending[cache_key] = (solve_state, [])
+            pending[cache_key][1].append((index, orientation))
+
+        if pending:
+            pool = get_batch_pool()
+            keys = list(pending)
+            boards = [pending[key][0] for key in keys]
+            chunksize = max(1, len(keys) // (BATCH_WORKERS * 4))
+            outcomes = pool.map(
+                run_solver_safely, [algorithm] * len(keys), boards,
+                [max_expanded] * len(keys), [timeout_ms] * len(keys), chunksize=chunksize
+            )
+            remaining = len(keys)
+            IN_FLIGHT.inc(remaining, algorithm=algorithm)
+            try:
+                for key, outcome in zip(keys, outcomes):
+                    remaining -= 1
+                    IN_FLIGHT.dec(algorithm=algorithm)
+                    record_solve(algorithm, outcome)
+                    boards = pending[key][1]
+                    if 'error' in outcome:
+                        for index, _ in boards:
+                            results[index] = outcome
+                        continue
+                    cached = cache_result(outcome, boards[0][1])
+                    if is_complete(outcome):
+                        solution_cache.put(key, cached)
+                    for index, orientation in boards:
+                        results[index] = orient_result(cached, orientation)
+            finally:
+                IN_FLIGHT.dec(remaining, algorithm=algorithm)
+
         return jsonify({
-            'path': solver.get_path(),
-            'moves': solver.get_moves(),
-            'cost': solver.get_cost(),
-            'expanded': solver.get_expanded(),
-            'depth': solver.get_depth(),
-            'runtime': solver.get_runtime(),
-            'found': solver.found
+            'algorithm': algorithm,
+            'count': len(start_states),
+            'solved': len(pending),
+            'results': results
         })
-        
+
     except Exception as e:
-        return jsonify({'error': f'Algorithm execution failed: {str(e)}'}), 500
+        reject(algorithm, 'exception')
+        return jsonify({'error': f'Batch execution failed: {str(e)}'}), 500
+
+def run_job(job):
+    return solve_cached(job.algorithm, job.start_state, job.budget, job.attach, goal_state=job.goal_state)
+
+job_manager = JobManager(run_job, JOB_WORKERS, max_pending=MAX_PENDING_JOBS)
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """Queue a solve in the background and return its id for polling"""
+    algorithm = None
+    try:
+        data = request.get_json()
+        algorithm = data.get('algorithm')
+        start_state = data.get('start_state')
+        goal_state = data.get('goal_state')
+        REQUESTS.inc(endpoint='jobs', algorithm=metric_label(algorithm))
+
+        reason, error = check_request(algorithm, start_state, goal_state)
+        if not error:
+            max_expanded, timeout_ms, error = resolve_budget(data, JOB_MAX_EXPANDED, JOB_TIMEOUT_MS)
+            reason = 'invalid_request'
+        if error:
+            reject(algorithm, reason)
+            return jsonify({'error': error}), 400
+
+        job = job_manager.submit(algorithm, start_state, max_expanded, timeout_ms, goal_state)
+        return jsonify(job.to_dict()), 202
+
+    except JobQueueFull:
+        reject(algorithm, 'queue_full')
+        return jsonify({'error': 'Too many jobs in progress. Try again later.'}), 503
+    except Exception as e:
+        reject(algorithm, 'exception')
+        return jsonify({'error': f'Job submission failed: {str(e)}'}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Return a job's status, progress so far and, once finished, its result"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Stop a queued or running job at its next budget check"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Server-Sent Events: a 'progress' event per solver report, then 'done'"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+
+    def generate():
+        for snapshot in job.watch():
+            event = 'progress' if snapshot['status'] in ACTIVE else 'done'
+            yield f'event: {event}\ndata: {json.dumps(snapshot)}\n\n'
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'message': 'Flask backend is running'})
+    return jsonify({
+        'status': 'healthy',
+        'message': 'Flask backend is running',
+        'cache': solution_cache.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition of the service metrics"""
+    stats = solution_cache.stats()
+    CACHE_HITS.set(stats['hits'])
+    CACHE_MISSES.set(stats['misses'])
+    CACHE_HIT_RATIO.set(stats['hit_ratio'])
+    CACHE_ENTRIES.set(stats['size'])
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,199 @@
+"""Benchmark every registered algorithm on seeded boards binned by optimal depth.
+
+    python benchmark.py --seed 1 --per-bin 5 --output bench.json
+
+Boards are random walks from the goal (for the shallow bins) and random
+solvable permutations (for the deep ones); their optimal depth comes from
+the precomputed distance table. Each (algorithm, board) pair runs once for
+timing and, unless --no-memory is given, once more under tracemalloc for
+peak memory, because tracing slows the search down several times.
+
+The JSON report holds one summary per algorithm and depth bin, plus the
+seed, board list and git commit, so runs from two commits can be diffed.
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from algorithms.board import CELL_MASK, COLS, GOAL, MOVES, SHIFTS, SIZE, decode, encode
+from algorithms.budget import Budget
+from algorithms.permutation import reachable_index
+from solving import ALGORITHMS, create_solver, get_state_table
+
+DEPTH_BINS = ((0, 7), (8, 15), (16, 23), (24, 31))
+
+
+def optimal_depth(table, board):
+    return table[reachable_index(encode(board))] >> 2
+
+
+def random_walk(rng, steps):
+    state = GOAL
+    previous = None
+    for _ in range(steps):
+        options = [move for move in MOVES[state & CELL_MASK] if move[0] != previous]
+        npos, action, tile_factor, blank_offset = rng.choice(options)
+        previous = state & CELL_MASK
+        tile = (state >> SHIFTS[npos]) & CELL_MASK
+        state = state + tile * tile_factor + blank_offset
+    return decode(state)
+
+
+def random_permutation(rng):
+    while True:
+        tiles = list(range(SIZE))
+        rng.shuffle(tiles)
+        board = [tiles[i:i + COLS] for i in range(0, SIZE, COLS)]
+        if reachable_index(encode(board)) is not None:
+            return board
+
+
+def generate_boards(table, seed, per_bin, bins=DEPTH_BINS):
+    """Return {bin: [(board, optimal depth), ...]} with per_bin boards each"""
+    rng = random.Random(seed)
+    boards = {depth_bin: [] for depth_bin in bins}
+    seen = set()
+    while any(len(found) < per_bin for found in boards.values()):
+        if rng.random() < 0.5:
+            board = random_walk(rng, rng.randint(0, 40))
+        else:
+            board = random_permutation(rng)
+        key = tuple(map(tuple, board))
+        if key in seen:
+            continue
+        seen.add(key)
+        depth = optimal_depth(table, board)
+        for low, high in bins:
+            if low <= depth <= high and len(boards[(low, high)]) < per_bin:
+                boards[(low, high)].append((board, depth))
+    return boards
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(algorithm, board, timeout_ms, memory):
+    solver = create_solver(algorithm, board, Budget(timeout_ms=timeout_ms))
+    start = time.perf_counter()
+    solver.run()
+    elapsed = time.perf_counter() - start
+    run = {
+        'runtime': elapsed,
+        # The whole search, so IDS includes every deepening iteration
+        'expanded': solver.get_expanded(),
+        'cost': solver.get_cost(),
+        'found': solver.found,
+        'status': solver.status
+    }
+    if memory:
+        solver = create_solver(algorithm, board, Budget(timeout_ms=timeout_ms))
+        tracemalloc.start()
+        solver.run()
+        run['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return run
+
+
+def summarize(runs, depths):
+    runtimes = [run['runtime'] for run in runs]
+    total_runtime = sum(runtimes)
+    gaps = [run['cost'] - depth for run, depth in zip(runs, depths) if run['found']]
+    summary = {
+        'runs': len(runs),
+        'solved': sum(1 for run in runs if run['found']),
+        'budget_exceeded': sum(1 for run in runs if run['status'] == 'budget_exceeded'),
+        'runtime_median': statistics.median(runtimes),
+        'runtime_p95': percentile(runtimes, 0.95),
+        'expansions_per_sec': sum(run['expanded'] for run in runs) / total_runtime if total_runtime else None,
+        'optimality_gap_mean': statistics.mean(gaps) if gaps else None,
+        'optimality_gap_max': max(gaps) if gaps else None
+    }
+    if runs and 'peak_memory' in runs[0]:
+        peaks = [run['peak_memory'] for run in runs]
+        summary['peak_memory_median'] = statistics.median(peaks)
+        summary['peak_memory_max'] = max(peaks)
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(algorithms, seed, per_bin, timeout_ms, memory, log=sys.stderr):
+    table = get_state_table()
+    boards = generate_boards(table, seed, per_bin)
+    report = {
+        'meta': {
+            'seed': seed,
+            'per_bin': per_bin,
+            'timeout_ms': timeout_ms,
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        },
+        'boards': {
+            f'{low}-{high}': [{'board': board, 'depth': depth} for board, depth in entries]
+            for (low, high), entries in boards.items()
+        },
+        'results': {}
+    }
+    for algorithm in algorithms:
+        # Warm-up so lazily built tables (pattern databases) are not timed
+        measure(algorithm, decode(GOAL), timeout_ms, False)
+        per_bin_summary = {}
+        for (low, high), entries in boards.items():
+            runs = [measure(algorithm, board, timeout_ms, memory) for board, _ in entries]
+            summary = summarize(runs, [depth for _, depth in entries])
+            per_bin_summary[f'{low}-{high}'] = summary
+            print(
+                f"{algorithm:18} {low:2}-{high:<2} median {summary['runtime_median'] * 1000:9.2f} ms"
+                f"  p95 {summary['runtime_p95'] * 1000:9.2f} ms  solved {summary['solved']}/{summary['runs']}",
+                file=log
+            )
+        report['results'][algorithm] = per_bin_summary
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--per-bin', type=int, default=5, help='boards per depth bin')
+    parser.add_argument('--algorithms', help='comma-separated subset (default: all)')
+    parser.add_argument('--timeout-ms', type=int, default=10000, help='per-run budget')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    registered = [entry['value'] for entry in ALGORITHMS]
+    algorithms = args.algorithms.split(',') if args.algorithms else registered
+    unknown = [name for name in algorithms if name not in registered]
+    if unknown:
+        parser.error(f"unknown algorithm(s): {', '.join(unknown)}")
+
+    report = run_benchmark(algorithms, args.seed, args.per_bin, args.timeout_ms, not args.no_memory)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
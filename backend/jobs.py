@@ -0,0 +1,173 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import uuid
+
+from algorithms.budget import BUDGET_EXCEEDED, Budget
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+ACTIVE = (QUEUED, RUNNING)
+
+
+class Job:
+    """One background solve. The runner hands the solver it creates to
+    ``attach`` so progress can be read while the search is running.
+
+    The frontier size is only reported by the solver's progress hook, which
+    is installed while someone is watching the job (see ``watch``).
+    """
+
+    def __init__(self, algorithm, start_state, budget, goal_state=None):
+        self.id = uuid.uuid4().hex
+        self.algorithm = algorithm
+        self.start_state = start_state
+        self.goal_state = goal_state
+        self.budget = budget
+        self.status = QUEUED
+        self.solver = None
+        self.result = None
+        self.error = None
+        self.future = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.frontier = 0
+        self._changed = threading.Condition()
+        self._watchers = 0
+
+    def attach(self, solver):
+        self.solver = solver
+
+    def progress(self):
+        solver = self.solver
+        if solver is None:
+            # Not started yet, or answered from the solution cache
+            result = self.result or {}
+            return {'expanded': result.get('expanded', 0), 'frontier': 0, 'depth': result.get('depth', 0)}
+        return {'expanded': solver.expanded, 'frontier': self.frontier, 'depth': solver.max_depth}
+
+    def report(self, expanded, frontier, depth):
+        """Budget.on_progress hook, called from the solver thread"""
+        with self._changed:
+            self.frontier = frontier
+            self._changed.notify_all()
+
+    def notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def watch(self, heartbeat=15.0):
+        """Yield to_dict() snapshots each time the search reports progress,
+        or every ``heartbeat`` seconds, ending with the job's final state."""
+        with self._changed:
+            self._watchers += 1
+            self.budget.on_progress = self.report
+        try:
+            while True:
+                with self._changed:
+                    if self.status in ACTIVE:
+                        self._changed.wait(heartbeat)
+                snapshot = self.to_dict()
+                yield snapshot
+                if snapshot['status'] not in ACTIVE:
+                    return
+        finally:
+            with self._changed:
+                self._watchers -= 1
+                if not self._watchers:
+                    self.budget.on_progress = None
+
+    def to_dict(self):
+        data = {
+            'id': self.id,
+            'algorithm': self.algorithm,
+            'status': self.status,
+            'progress': self.progress()
+        }
+        if self.started is not None:
+            data['elapsed'] = (self.finished or time.time()) - self.started
+        if self.result is not None:
+            data['result'] = self.result
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+class JobManager:
+    """Runs jobs on a thread pool so solver objects, and therefore progress
+    and cancellation, stay reachable from request handlers.
+
+    ``runner(job)`` does the solve and returns the result payload. At most
+    ``max_pending`` jobs may be queued or running; the ``max_finished`` most
+    recent finished jobs are kept for polling.
+    """
+
+    def __init__(self, runner, max_workers, max_pending=64, max_finished=256):
+        self.runner = runner
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='solver-job')
+        self._jobs = OrderedDict()
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, algorithm, start_state, max_expanded=None, timeout_ms=None, goal_state=None):
+        job = Job(algorithm, start_state, Budget(max_expanded, timeout_ms), goal_state)
+        with self._lock:
+            if len(self._jobs) >= self.max_pending:
+                raise JobQueueFull()
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id) or self._finished.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns it, or None if unknown."""
+        job = self.get(job_id)
+        if job is None or job.status not in ACTIVE:
+            return job
+        job.budget.cancel()
+        if job.future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def _run(self, job):
+        if job.budget.cancelled:
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            job.result = self.runner(job)
+        except Exception as e:
+            job.error = f'Algorithm execution failed: {str(e)}'
+            self._finish(job, FAILED)
+            return
+        stopped = job.budget.cancelled and job.result.get('status') == BUDGET_EXCEEDED
+        self._finish(job, CANCELLED if stopped else FINISHED)
+
+    def _finish(self, job, status):
+        with self._lock:
+            if job.id not in self._jobs:
+                return
+            job.status = status
+            job.finished = time.time()
+            del self._jobs[job.id]
+            self._finished[job.id] = job
+            while len(self._finished) > self.max_finished:
+                self._finished.popitem(last=False)
+        job.notify()
@@ -0,0 +1,172 @@
+"""Minimal Prometheus text-format metrics for the solver service.
+
+Counters, gauges and histograms keep their samples in memory, keyed by label
+values, and ``REGISTRY.render()`` writes them out in the text exposition
+format served at /metrics. Nothing is pushed anywhere, so no client library
+or external service is needed.
+"""
+
+import threading
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+EXPANDED_BUCKETS = (10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(labels[name] for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+    def _render_samples(self, items):
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in items
+        ]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        """Copy in a total that is counted elsewhere, such as the solution
+        cache's hits, just before rendering. It must never go down."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def _render_samples(self, items):
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    'puzzle_requests_total', 'Solve requests by endpoint and algorithm.', ('endpoint', 'algorithm')
+))
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    'puzzle_request_duration_seconds', 'Latency of /api/run-algorithm requests, cache hits included.',
+    ('algorithm',), LATENCY_BUCKETS
+))
+SOLVE_RUNTIME = REGISTRY.register(Histogram(
+    'puzzle_solve_duration_seconds', 'Solver runtime of searches that actually ran.',
+    ('algorithm',), LATENCY_BUCKETS
+))
+NODES_EXPANDED = REGISTRY.register(Histogram(
+    'puzzle_nodes_expanded', 'Nodes expanded by searches that actually ran.',
+    ('algorithm',), EXPANDED_BUCKETS
+))
+SOLVE_RESULTS = REGISTRY.register(Counter(
+    'puzzle_solve_results_total', 'Finished searches by status (solved, not_found, budget_exceeded).',
+    ('algorithm', 'status')
+))
+ERRORS = REGISTRY.register(Counter(
+    'puzzle_errors_total', 'Rejected or failed solves by reason.', ('algorithm', 'reason')
+))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    'puzzle_solves_in_flight', 'Searches currently running or queued on the batch pool.', ('algorithm',)
+))
+CACHE_HITS = REGISTRY.register(Counter('puzzle_cache_hits_total', 'Solution cache hits since start.'))
+CACHE_MISSES = REGISTRY.register(Counter('puzzle_cache_misses_total', 'Solution cache misses since start.'))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge('puzzle_cache_hit_ratio', 'Solution cache hits / lookups.'))
+CACHE_ENTRIES = REGISTRY.register(Gauge('puzzle_cache_entries', 'Entries in the solution cache.'))
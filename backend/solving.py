@@ -0,0 +1,317 @@
+"""Solver registry and helpers shared by the Flask routes and batch workers.
+
+This module does not import Flask, so ProcessPoolExecutor workers can import
+it cheaply and call ``run_solver`` directly.
+"""
+
+import os
+import threading
+import time
+
+from algorithms.dfs import DFS
+from algorithms.bfs import BFS
+from algorithms.bidirectional import BidirectionalBFS
+from algorithms.ids import IDS
+from algorithms.a_star import AStarM, AStarE, AStarLC, AStarPDB
+from algorithms.ida_star import IDAStar
+from algorithms.table import TableSolver
+from algorithms.table_file import open_table
+from algorithms.grid_pattern_database import PatternDatabase15, load_databases
+from algorithms import vector_bfs
+from algorithms.budget import BUDGET_EXCEEDED, Budget
+from algorithms.symmetry import canonicalize, transpose_result
+from algorithms.board import geometry_of
+from algorithms.goal import GoalMapping, blank_in_corner, is_standard_goal
+
+ALGORITHMS = [
+    {'value': 'dfs', 'label': 'Depth-First Search (DFS)'},
+    {'value': 'bfs', 'label': 'Breadth-First Search (BFS)'},
+    {'value': 'bfs_compact', 'label': 'Breadth-First Search (BFS, compact memory)'},
+    {'value': 'ids', 'label': 'Iterative DFS (IDS)'},
+    {'value': 'bidirectional_bfs', 'label': 'Bidirectional BFS'},
+    { 'value': 'a_star_m', 'label': 'A* Search using manhattan_distance' },
+    { 'value': 'a_star_e', 'label': 'A* Search using Euclidean Distance' },
+    { 'value': 'a_star_lc', 'label': 'A* Search using Manhattan + Linear Conflict' },
+    { 'value': 'a_star_pdb', 'label': 'A* Search using Pattern Databases' },
+    { 'value': 'ida_star', 'label': 'IDA* using Manhattan + Linear Conflict' },
+    { 'value': 'table', 'label': 'Precomputed Distance Table' }
+]
+
+A_STAR_VARIANTS = {
+    'a_star_m': AStarM,
+    'a_star_e': AStarE,
+    'a_star_lc': AStarLC,
+    'a_star_pdb': AStarPDB,
+}
+
+# Only IDA* is written against board.Geometry; every other solver (and the
+# tables behind A*, BFS compact and the state table) is 3x3 specific.
+GRID_ALGORITHMS = {'ida_star'}
+MIN_SIDE = 2
+MAX_SIDE = 5
+
+# Algorithms whose answer has the same cost for a board and its transpose,
+# so they can share cache entries through symmetry.canonicalize. DFS is
+# left out: its first-found path depends on the board's orientation.
+SYMMETRIC_ALGORITHMS = {
+    'bfs', 'bfs_compact', 'ids', 'bidirectional_bfs', 'a_star_m', 'a_star_e',
+    'a_star_lc', 'a_star_pdb', 'ida_star', 'table'
+}
+
+# Distance/move table for the 'table' algorithm. It is memory-mapped on the
+# first request that needs it, so all workers share one page-cached copy;
+# it is only built if the file is missing (see algorithms/table_file.py).
+STATE_TABLE_PATH = os.environ.get(
+    'STATE_TABLE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'state_table.bin')
+)
+_state_table = None
+_state_table_lock = threading.Lock()
+# 5-5-5 pattern databases that IDA* uses on 4x4 boards. Building them takes
+# a while, so requests only ever map a prebuilt file (python -m
+# algorithms.grid_pattern_database); if it is missing or invalid, 4x4 boards
+# fall back to linear conflicts until the process restarts.
+PATTERN_DB_PATH = os.environ.get(
+    'PATTERN_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pattern_db_4x4.bin')
+)
+_pattern_database = None
+_pattern_database_loaded = False
+_pattern_database_lock = threading.Lock()
+
+# Server-side caps on one solve. A request may ask for less through its
+# max_expanded / timeout_ms fields but never for more; 0 means unlimited.
+SOLVER_MAX_EXPANDED = int(os.environ.get('SOLVER_MAX_EXPANDED', '0')) or None
+SOLVER_TIMEOUT_MS = int(os.environ.get('SOLVER_TIMEOUT_MS', '30000')) or None
+# Background jobs (/api/jobs) exist for long searches, so their caps are looser
+JOB_MAX_EXPANDED = int(os.environ.get('JOB_MAX_EXPANDED', '0')) or None
+JOB_TIMEOUT_MS = int(os.environ.get('JOB_TIMEOUT_MS', '600000')) or None
+# Let A* expand this many equal-f nodes at once and score their successors
+# with NumPy (algorithms.batch_heuristics); 0 keeps per-node scoring.
+ASTAR_BATCH_SIZE = int(os.environ.get('ASTAR_BATCH_SIZE', '0')) or None
+# Plain BFS expands whole layers with NumPy when it is installed; the result
+# is identical, so this only exists to rule the NumPy path out
+VECTORIZED_BFS = os.environ.get('VECTORIZED_BFS', '1') != '0' and vector_bfs.available()
+
+def get_state_table():
+    global _state_table
+    if _state_table is None:
+        with _state_table_lock:
+            if _state_table is None:
+                _state_table = open_table(STATE_TABLE_PATH)
+    return _state_table
+
+def get_pattern_database_4x4():
+    global _pattern_database, _pattern_database_loaded
+    if not _pattern_database_loaded:
+        with _pattern_database_lock:
+            if not _pattern_database_loaded:
+                try:
+                    _pattern_database = PatternDatabase15(load_databases(PATTERN_DB_PATH))
+                except (OSError, ValueError):
+                    _pattern_database = None
+                _pattern_database_loaded = True
+    return _pattern_database
+
+def create_solver(algorithm, start_state, budget=None):
+    """Return a solver for the given algorithm, or None if it is unknown"""
+    if algorithm == 'dfs':
+        return DFS(start_state, budget=budget)
+    elif algorithm == 'bfs':
+        return BFS(start_state, budget=budget, vectorized=VECTORIZED_BFS)
+    elif algorithm == 'bfs_compact':
+        return BFS(start_state, compact=True, budget=budget)
+    elif algorithm == 'ids':
+        return IDS(start_state, budget=budget)
+    elif algorithm == 'bidirectional_bfs':
+        return BidirectionalBFS(start_state, budget=budget)
+    elif algorithm in A_STAR_VARIANTS:
+        solver_class = A_STAR_VARIANTS[algorithm]
+        batch_size = ASTAR_BATCH_SIZE if solver_class.batch_heuristic else None
+        return solver_class(start_state, budget=budget, batch_size=batch_size)
+    elif algorithm == 'ida_star':
+        if len(start_state) == 4 and len(start_state[0]) == 4:
+            return IDAStar(start_state, budget=budget, pattern_database=get_pattern_database_4x4())
+        return IDAStar(start_state, budget=budget)
+    elif algorithm == 'table':
+        return TableSolver(start_state, get_state_table(), budget=budget)
+    return None
+
+def is_solvable( state, goal_state=None):
+    """Whether state can reach goal_state (the standard goal by default)"""
+    state = to_standard_goal(state, goal_state)[0]
+    geometry = geometry_of(state)
+    return geometry.is_solvable(geometry.encode(state))
+
+def to_standard_goal(start_state, goal_state=None):
+    """Return (equivalent board for the standard goal, GoalMapping or None)"""
+    if goal_state is None or is_standard_goal(goal_state):
+        return start_state, None
+    mapping = GoalMapping(goal_state)
+    return mapping.to_board(start_state), mapping
+
+def is_grid(state):
+    """Whether state is a rectangular list of lists within the size limits"""
+    if not isinstance(state, list) or not MIN_SIDE <= len(state) <= MAX_SIDE:
+        return False
+    if not all(isinstance(row, list) for row in state):
+        return False
+    cols = len(state[0])
+    return MIN_SIDE <= cols <= MAX_SIDE and all(len(row) == cols for row in state)
+
+def check_grid(state, field):
+    """Return an error message if state is not a valid board, or None"""
+    if not is_grid(state):
+        return (
+            f'Invalid {field} format. Must be a rectangular grid from '
+            f'{MIN_SIDE}x{MIN_SIDE} to {MAX_SIDE}x{MAX_SIDE}.'
+        )
+    size = len(state) * len(state[0])
+    tiles = [tile for row in state for tile in row]
+    # type() rather than isinstance() so floats and booleans are rejected
+    if any(type(tile) is not int for tile in tiles) or sorted(tiles) != list(range(size)):
+        return f'Invalid {field}. Tiles must be the integers 0..{size - 1}, each once.'
+    return None
+
+def check_request(algorithm, start_state, goal_state=None):
+    """Return (reason, error message) for a bad algorithm/board pair, or
+    (None, None). The reason is a short label for metrics."""
+    if not algorithm or not start_state:
+        return 'invalid_request', 'Missing algorithm or start_state'
+
+    error = check_grid(start_state, 'start_state')
+    if error:
+        return 'invalid_request', error
+
+    if goal_state is not None:
+        error = check_grid(goal_state, 'goal_state')
+        if error:
+            return 'invalid_request', error
+        if (len(goal_state), len(goal_state[0])) != (len(start_state), len(start_state[0])):
+            return 'invalid_request', 'goal_state must have the same shape as start_state.'
+        if not blank_in_corner(goal_state):
+            return 'invalid_request', 'goal_state must have the blank (0) in a corner.'
+
+    if not isinstance(algorithm, str) or algorithm not in {entry['value'] for entry in ALGORITHMS}:
+        return 'unknown_algorithm', f'Unknown algorithm: {algorithm}'
+
+    if (len(start_state), len(start_state[0])) != (3, 3) and algorithm not in GRID_ALGORITHMS:
+        return 'invalid_request', (
+            f'{algorithm} only supports 3x3 boards. Use one of: {", ".join(sorted(GRID_ALGORITHMS))}.'
+        )
+
+    if algorithm == 'dfs' and not is_solvable(start_state, goal_state):
+        return 'unsolvable', 'The provided puzzle state is unsolvable.'
+    return None, None
+
+def metric_label(algorithm):
+    """Algorithm name to use as a metric label; unknown names share one"""
+    if isinstance(algorithm, str) and algorithm in {entry['value'] for entry in ALGORITHMS}:
+        return algorithm
+    return 'unknown'
+
+def _capped(requested, cap):
+    if requested is None:
+        return cap
+    return requested if cap is None else min(requested, cap)
+
+def resolve_budget(data, max_expanded_cap=SOLVER_MAX_EXPANDED, timeout_cap=SOLVER_TIMEOUT_MS):
+    """Return (max_expanded, timeout_ms, error) from a request payload"""
+    limits = []
+    for field in ('max_expanded', 'timeout_ms'):
+        value = data.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            return None, None, f'Invalid {field}. Must be a non-negative integer.'
+        limits.append(value)
+    max_expanded, timeout_ms = limits
+    return _capped(max_expanded, max_expanded_cap), _capped(timeout_ms, timeout_cap), None
+
+def canonical_request(algorithm, start_state, goal_state=None):
+    """Return (board to solve, board to cache it under, orientation).
+
+    The board is posed against the standard goal, so every goal shares the
+    solvers' tables and the solution cache. Only the cache key is reduced to
+    the symmetry-class representative: the board that was asked for is the
+    one solved, so a miss reports that board's own search.
+    """
+    solve_state, mapping = to_standard_goal(start_state, goal_state)
+    cache_state, transposed = solve_state, False
+    # Transposing only maps the puzzle onto itself when the board is square
+    if algorithm in SYMMETRIC_ALGORITHMS and len(solve_state) == len(solve_state[0]):
+        cache_state, transposed = canonicalize(solve_state)
+    return solve_state, cache_state, (mapping, transposed)
+
+def cache_result(result, orientation):
+    """Put a result for the board to solve in the cache's orientation"""
+    if orientation[1]:
+        result = transpose_result(result)
+    return result
+
+def orient_result(result, orientation, cached=True):
+    """Map a result back onto the requested board. A ``cached`` result is
+    for the cache's board; otherwise it is for the board to solve."""
+    mapping, transposed = orientation
+    if cached and transposed:
+        result = transpose_result(result)
+    if mapping is not None:
+        result = mapping.map_result(result)
+    return result
+
+def build_result(solver):
+    # Return results in EXACT format expected by frontend
+    result = {
+        'path': solver.get_path(),
+        'moves': solver.get_moves(),
+        'cost': solver.get_cost(),
+        'expanded': solver.get_expanded(),
+        'depth': solver.get_depth(),
+        'runtime': solver.get_runtime(),
+        'found': solver.found,
+        'status': solver.status
+    }
+    if solver.profile is not None:
+        result['profile'] = solver.profile.to_dict(round(solver.runtime * 1e9))
+    return result
+
+def is_complete(result):
+    """Whether a result payload may be cached (it did not run out of budget)"""
+    return result.get('status') != BUDGET_EXCEEDED
+
+def run_solver(algorithm, start_state, max_expanded=None, timeout_ms=None):
+    """Solve one validated board and return the result payload"""
+    solver = create_solver(algorithm, start_state, Budget(max_expanded, timeout_ms))
+    solver.run()
+    return build_result(solver)
+
+def run_solver_safely(algorithm, start_state, max_expanded=None, timeout_ms=None):
+    """run_solver for pool workers: failures come back as an error payload"""
+    try:
+        return run_solver(algorithm, start_state, max_expanded, timeout_ms)
+    except Exception as e:
+        return {'error': f'Algorithm execution failed: {str(e)}'}
+
+def compare_heuristics(start_state, max_expanded=None, timeout_ms=None, goal_state=None, solve=None):
+    """Run every A* heuristic on the same board and report its node count.
+
+    Each variant may expand up to ``max_expanded`` nodes, but ``timeout_ms``
+    covers the whole comparison: every run gets whatever time the earlier
+    ones left. ``solve(algorithm, timeout_ms)`` may supply the result
+    payload instead, e.g. through the solution cache.
+    """
+    if solve is None:
+        solve_state = to_standard_goal(start_state, goal_state)[0]
+
+        def solve(algorithm, timeout_ms):
+            return run_solver(algorithm, solve_state, max_expanded, timeout_ms)
+
+    deadline = None if timeout_ms is None else time.monotonic() + timeout_ms / 1000
+    comparison = []
+    for name in A_STAR_VARIANTS:
+        remaining_ms = None if deadline is None else max(0, (deadline - time.monotonic()) * 1000)
+        result = solve(name, remaining_ms)
+        comparison.append({
+            'algorithm': name,
+            'expanded': result['expanded'],
+            'cost': result['cost'],
+            'runtime': result['runtime'],
+            'status': result['status']
+        })
+    return comparison
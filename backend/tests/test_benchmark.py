@@ -0,0 +1,13 @@
+from benchmark import measure, summarize
+
+
+def test_ids_throughput_counts_every_iteration():
+    board = [[1, 2, 5], [3, 4, 0], [6, 7, 8]]
+    ids = measure('ids', board, None, False)
+    bfs = measure('bfs', board, None, False)
+    # Depth-first deepening re-expands the shallow levels, so it can never
+    # report fewer nodes than the breadth-first search of the same board
+    assert ids['found'] and bfs['found']
+    assert ids['expanded'] > bfs['expanded']
+    summary = summarize([ids], [ids['cost']])
+    assert summary['expansions_per_sec'] == ids['expanded'] / ids['runtime']
@@ -0,0 +1,27 @@
+from collections import deque
+from itertools import permutations
+
+import pytest
+
+from algorithms.board import get_geometry
+
+
+def reachable(geometry):
+    seen = {geometry.goal}
+    queue = deque([geometry.goal])
+    while queue:
+        for neighbor, _ in geometry.neighbors(queue.popleft()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return seen
+
+
+@pytest.mark.parametrize("rows, cols", [(2, 2), (2, 3), (3, 2), (2, 4), (4, 2)])
+def test_is_solvable_matches_reachability(rows, cols):
+    geometry = get_geometry(rows, cols)
+    goal_side = reachable(geometry)
+    for tiles in permutations(range(rows * cols)):
+        board = [list(tiles[r * cols:(r + 1) * cols]) for r in range(rows)]
+        state = geometry.encode(board)
+        assert geometry.is_solvable(state) == (state in goal_side), board
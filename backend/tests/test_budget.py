@@ -0,0 +1,51 @@
+import pytest
+
+from algorithms.budget import BUDGET_EXCEEDED, CHECK_INTERVAL, SOLVED, Budget
+from solving import ALGORITHMS, build_result, create_solver
+
+ALGORITHM_NAMES = [entry['value'] for entry in ALGORITHMS]
+# The table solver's walk is at most 31 lookups, so it only checks once
+SEARCHES = [name for name in ALGORITHM_NAMES if name != 'table']
+# 27 moves from the goal, so every solver needs more than a handful of nodes
+BOARD = [[8, 6, 7], [2, 5, 4], [3, 0, 1]]
+
+
+def run(algorithm, budget):
+    solver = create_solver(algorithm, BOARD, budget)
+    solver.run()
+    return build_result(solver)
+
+
+@pytest.mark.parametrize("algorithm", SEARCHES)
+def test_max_expanded_stops_with_partial_stats(algorithm):
+    result = run(algorithm, Budget(max_expanded=5))
+    assert result['status'] == BUDGET_EXCEEDED
+    assert not result['found']
+    assert result['path'] == [] and result['moves'] == [] and result['cost'] == 0
+    assert result['expanded'] == 5
+    assert 0 <= result['depth'] < 27
+    assert result['runtime'] > 0
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHM_NAMES)
+def test_cancelled_budget_stops_at_the_next_check(algorithm):
+    budget = Budget()
+    budget.cancel()
+    result = run(algorithm, budget)
+    if result['status'] == SOLVED:
+        # Only searches that finish before their first check may solve
+        assert result['expanded'] < CHECK_INTERVAL
+    else:
+        assert result['status'] == BUDGET_EXCEEDED
+        assert result['expanded'] <= CHECK_INTERVAL
+
+
+def test_progress_hook_sees_the_search():
+    reports = []
+    budget = Budget(
+        max_expanded=20000, on_progress=lambda *report: reports.append(report), progress_interval=4096
+    )
+    result = run('bfs', budget)
+    assert result['status'] == BUDGET_EXCEEDED
+    # The first check comes after CHECK_INTERVAL nodes
+    assert [expanded for expanded, _, _ in reports] == [CHECK_INTERVAL + 4096 * k for k in range(5)]
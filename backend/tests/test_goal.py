@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from algorithms.goal import GoalMapping, is_standard_goal
+from algorithms.ida_star import IDAStar
+from solving import check_request
+
+STEPS = {"Up": (-1, 0), "Down": (1, 0), "Left": (0, -1), "Right": (0, 1)}
+
+
+def corner_goal(rng, rows, cols, corner):
+    tiles = list(range(1, rows * cols))
+    rng.shuffle(tiles)
+    blank = corner[0] * cols + corner[1]
+    tiles.insert(blank, 0)
+    return [tiles[r * cols:(r + 1) * cols] for r in range(rows)]
+
+
+def blank_cell(grid):
+    return next((i, j) for i, row in enumerate(grid) for j, tile in enumerate(row) if tile == 0)
+
+
+def slide(grid, move):
+    # Moves name the direction the blank goes
+    i, j = blank_cell(grid)
+    di, dj = STEPS[move]
+    moved = [list(row) for row in grid]
+    moved[i][j], moved[i + di][j + dj] = moved[i + di][j + dj], 0
+    return moved
+
+
+def scramble(rng, grid, steps):
+    for _ in range(steps):
+        i, j = blank_cell(grid)
+        moves = [
+            move for move, (di, dj) in STEPS.items()
+            if 0 <= i + di < len(grid) and 0 <= j + dj < len(grid[0])
+        ]
+        grid = slide(grid, rng.choice(moves))
+    return grid
+
+
+@pytest.mark.parametrize("rows, cols", [(3, 3), (2, 3), (3, 4)])
+def test_round_trip_for_every_corner(rows, cols):
+    rng = random.Random(rows * 10 + cols)
+    for corner in ((0, 0), (0, cols - 1), (rows - 1, 0), (rows - 1, cols - 1)):
+        goal = corner_goal(rng, rows, cols, corner)
+        mapping = GoalMapping(goal)
+        assert is_standard_goal(mapping.to_board(goal))
+        assert mapping.from_board(mapping.to_board(goal)) == goal
+        board = scramble(rng, goal, 30)
+        assert mapping.from_board(mapping.to_board(board)) == board
+
+
+def test_mapped_solution_reaches_the_callers_goal():
+    rng = random.Random(7)
+    for corner in ((0, 0), (0, 2), (2, 0), (2, 2)):
+        goal = corner_goal(rng, 3, 3, corner)
+        start = scramble(rng, goal, 20)
+        mapping = GoalMapping(goal)
+        solver = IDAStar(mapping.to_board(start))
+        solver.run()
+        result = mapping.map_result({'path': solver.get_path(), 'moves': solver.get_moves()})
+        assert result['path'][0] == start
+        assert result['path'][-1] == goal
+        for before, move, after in zip(result['path'], result['moves'], result['path'][1:]):
+            assert slide(before, move) == after
+
+
+def test_goal_without_a_corner_blank_is_rejected():
+    goal = [[1, 0, 2], [3, 4, 5], [6, 7, 8]]
+    with pytest.raises(ValueError):
+        GoalMapping(goal)
+    reason, error = check_request('a_star_m', [[1, 2, 0], [3, 4, 5], [6, 7, 8]], goal)
+    assert reason == 'invalid_request'
+    assert 'corner' in error
@@ -0,0 +1,36 @@
+from algorithms.board import GOAL, decode, neighbors
+from algorithms.budget import Budget
+from algorithms.ids import IDS
+
+
+def test_expanded_counts_every_iteration():
+    start = neighbors(GOAL)[0][0]
+    solver = IDS(decode(start))
+    solver.run()
+    # Depth limit 1 expands the start; limit 2 expands it again and then its
+    # children in move order up to the goal
+    goal_index = [neighbor for neighbor, _ in neighbors(start)].index(GOAL)
+    assert solver.found
+    assert solver.get_expanded() == 2 + goal_index + 1
+
+
+def test_expanded_matches_the_budget():
+    board = [[1, 2, 5], [3, 4, 0], [6, 7, 8]]
+    solver = IDS(board)
+    solver.run()
+    limited = IDS(board, budget=Budget(max_expanded=solver.get_expanded() - 1))
+    limited.run()
+    assert limited.status == "budget_exceeded"
+    assert limited.get_expanded() == solver.get_expanded() - 1
+
+
+def test_progress_never_goes_backwards():
+    # Jobs poll solver.expanded while the search runs
+    seen = []
+    solver = IDS([[8, 6, 7], [2, 5, 4], [3, 0, 1]], budget=Budget(
+        max_expanded=200000, on_progress=lambda *_: seen.append(solver.expanded), progress_interval=1000
+    ))
+    solver.run()
+    assert len(seen) > 1
+    assert seen == sorted(seen)
+    assert solver.get_expanded() == 200000
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from algorithms.open_list import BucketQueue
+
+
+def reference_pop(entries):
+    # Lowest f, then highest g, then the newest entry
+    best = min(entries, key=lambda entry: (entry[0], -entry[1], -entry[2]))
+    entries.remove(best)
+    return best
+
+
+def test_bucket_queue_pop_order():
+    rng = random.Random(0)
+    queue = BucketQueue()
+    entries = []
+    for seq in range(5000):
+        if entries and rng.random() < 0.4:
+            assert queue.min_f() == min(entry[0] for entry in entries)
+            assert queue.pop() == reference_pop(entries)
+        else:
+            f = rng.randrange(30)
+            entry = (f, rng.randrange(f + 1), seq)
+            queue.push(entry[0], entry[1], entry)
+            entries.append(entry)
+        assert len(queue) == len(entries)
+    while entries:
+        assert queue.pop() == reference_pop(entries)
+
+
+def test_bucket_queue_push_below_lowest():
+    queue = BucketQueue()
+    queue.push(5, 2, "a")
+    assert queue.pop() == "a"
+    queue.push(7, 0, "b")
+    queue.push(3, 1, "c")
+    assert queue.min_f() == 3
+    assert [queue.pop(), queue.pop()] == ["c", "b"]
+
+
+def test_empty_bucket_queue_raises():
+    queue = BucketQueue()
+    with pytest.raises(IndexError):
+        queue.pop()
+    with pytest.raises(IndexError):
+        queue.min_f()
+
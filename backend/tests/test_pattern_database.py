@@ -0,0 +1,29 @@
+import random
+
+from algorithms.board import CELL_MASK, GOAL, MOVES, SHIFTS, SIZE
+from algorithms.pattern_database import PATTERN_DATABASE_HEURISTIC, PATTERNS, group_key, placement_key
+from algorithms.permutation import STATE_COUNT, state_unrank
+
+
+def sample_boards(count=500, seed=0):
+    rng = random.Random(seed)
+    return [GOAL] + [state_unrank(rng.randrange(STATE_COUNT)) for _ in range(count)]
+
+
+def test_group_key_matches_placement_key():
+    for state in sample_boards():
+        for group, pattern in enumerate(PATTERNS):
+            cells = [pos for tile in pattern for pos in range(SIZE) if (state >> SHIFTS[pos]) & CELL_MASK == tile]
+            assert group_key(state, group) == placement_key(cells)
+
+
+def test_update_matches_estimate():
+    heuristic = PATTERN_DATABASE_HEURISTIC
+    assert heuristic.estimate(GOAL) == 0
+    for state in sample_boards():
+        h = heuristic.estimate(state)
+        blank = state & CELL_MASK
+        for npos, action, tile_factor, blank_offset in MOVES[blank]:
+            tile = (state >> SHIFTS[npos]) & CELL_MASK
+            neighbor = state + tile * tile_factor + blank_offset
+            assert heuristic.update(h, state, neighbor, tile, blank, npos) == heuristic.estimate(neighbor)
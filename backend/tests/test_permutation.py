@@ -0,0 +1,27 @@
+import random
+
+from algorithms.board import CELL_MASK, GOAL, neighbors
+from algorithms.permutation import STATE_COUNT, rank_after_move, state_rank, state_unrank
+
+
+def sample_boards(count=2000, seed=0):
+    rng = random.Random(seed)
+    return [GOAL] + [state_unrank(rng.randrange(STATE_COUNT)) for _ in range(count)]
+
+
+def test_state_unrank_inverts_state_rank():
+    for state in sample_boards():
+        assert state_unrank(state_rank(state)) == state
+
+
+def test_state_rank_covers_every_index():
+    for index in (0, 1, STATE_COUNT // 2, STATE_COUNT - 1):
+        assert state_rank(state_unrank(index)) == index
+
+
+def test_rank_after_move_matches_state_rank():
+    for state in sample_boards():
+        index = state_rank(state)
+        for neighbor, _ in neighbors(state):
+            npos = neighbor & CELL_MASK
+            assert rank_after_move(index, state, npos) == state_rank(neighbor)
@@ -0,0 +1,48 @@
+import random
+
+from algorithms.board import GOAL, decode
+from algorithms.bfs import BFS
+from algorithms.permutation import STATE_COUNT, state_unrank
+from algorithms.symmetry import canonicalize, transpose_board, transpose_result
+from solving import canonical_request
+
+
+def sample_grids(count=200, seed=0):
+    rng = random.Random(seed)
+    return [decode(state_unrank(rng.randrange(STATE_COUNT))) for _ in range(count)]
+
+
+def test_transpose_fixes_the_goal_and_is_an_involution():
+    assert transpose_board(decode(GOAL)) == decode(GOAL)
+    for grid in sample_grids():
+        assert transpose_board(transpose_board(grid)) == grid
+
+
+def test_canonicalize_picks_one_board_per_class():
+    for grid in sample_grids():
+        representative, transposed = canonicalize(grid)
+        assert canonicalize(transpose_board(grid))[0] == representative
+        assert representative == (transpose_board(grid) if transposed else grid)
+
+
+def test_transpose_result_swaps_moves():
+    board = [[3, 1, 2], [6, 4, 5], [7, 0, 8]]
+    solver = BFS(transpose_board(board))
+    solver.run()
+    result = transpose_result({'path': solver.get_path(), 'moves': solver.get_moves()})
+    assert result['path'][0] == board
+    assert result['path'][-1] == decode(GOAL)
+    swapped = {'Up': 'Left', 'Left': 'Up', 'Down': 'Right', 'Right': 'Down'}
+    assert result['moves'] == [swapped[move] for move in solver.get_moves()]
+
+    direct = BFS(board)
+    direct.run()
+    assert len(result['moves']) == direct.get_cost()
+
+
+def test_canonical_request_solves_the_requested_board():
+    for grid in sample_grids(20):
+        solve_state, cache_state, (mapping, transposed) = canonical_request('bfs', grid)
+        assert solve_state == grid
+        assert (cache_state, transposed) == canonicalize(grid)
+        assert mapping is None
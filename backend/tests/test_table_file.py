@@ -0,0 +1,69 @@
+import struct
+
+import pytest
+
+from algorithms.board import encode
+from algorithms.table import build_table
+from algorithms.table_file import HEADER, load_table, open_table, save_table
+
+
+@pytest.fixture(scope="module")
+def table():
+    return build_table()
+
+
+@pytest.fixture
+def table_path(tmp_path, table):
+    path = tmp_path / "state_table.bin"
+    save_table(str(path), table)
+    return path
+
+
+def corrupt(path, offset, data):
+    contents = bytearray(path.read_bytes())
+    contents[offset:offset + len(data)] = data
+    path.write_bytes(bytes(contents))
+
+
+def test_round_trip(table_path, table):
+    assert bytes(load_table(str(table_path))) == bytes(table)
+
+
+def test_rejects_bad_magic(table_path):
+    corrupt(table_path, 0, b"XXXX")
+    with pytest.raises(ValueError, match="not a state table file"):
+        load_table(str(table_path))
+
+
+def test_rejects_other_versions(table_path):
+    corrupt(table_path, 4, struct.pack("<H", 99))
+    with pytest.raises(ValueError, match="unsupported format version 99"):
+        load_table(str(table_path))
+
+
+def test_rejects_checksum_mismatch(table_path):
+    contents = table_path.read_bytes()
+    corrupt(table_path, HEADER.size + 100, bytes([contents[HEADER.size + 100] ^ 0xFF]))
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        load_table(str(table_path))
+
+
+def test_rejects_truncated_files(table_path):
+    table_path.write_bytes(table_path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="file length"):
+        load_table(str(table_path))
+    table_path.write_bytes(b"P8DT")
+    with pytest.raises(ValueError, match="truncated header"):
+        load_table(str(table_path))
+
+
+def test_rejects_other_goals(table_path):
+    other_goal = encode([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+    with pytest.raises(ValueError, match="different goal"):
+        load_table(str(table_path), other_goal)
+
+
+def test_open_table_rebuilds_invalid_files(table_path, table):
+    corrupt(table_path, 0, b"XXXX")
+    assert bytes(open_table(str(table_path))) == bytes(table)
+    assert bytes(load_table(str(table_path))) == bytes(table)
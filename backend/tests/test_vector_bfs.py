@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from algorithms import vector_bfs
+from algorithms.batch_heuristics import boards_from_packed
+from algorithms.bfs import BFS
+from algorithms.board import CELL_MASK, GOAL
+from algorithms.budget import Budget
+from algorithms.permutation import STATE_COUNT, state_rank, state_unrank
+
+np = pytest.importorskip("numpy")
+
+BOARDS = [
+    [[0, 1, 2], [3, 4, 5], [6, 7, 8]],
+    [[1, 2, 5], [3, 4, 0], [6, 7, 8]],
+    [[8, 6, 7], [2, 5, 4], [3, 0, 1]],
+    [[1, 0, 2], [3, 4, 5], [6, 8, 7]],  # unsolvable
+]
+
+
+def stats(solver):
+    return (solver.status, solver.get_path(), solver.get_moves(), solver.get_expanded(), solver.get_depth())
+
+
+def test_ranks_of_matches_state_rank():
+    rng = random.Random(0)
+    states = [state_unrank(rng.randrange(STATE_COUNT)) for _ in range(1000)]
+    boards = boards_from_packed(states)
+    blanks = np.array([state & CELL_MASK for state in states], dtype=np.intp)
+    assert vector_bfs.ranks_of(boards, blanks).tolist() == [state_rank(state) for state in states]
+
+
+@pytest.mark.parametrize("board", BOARDS)
+def test_matches_queue_bfs(board):
+    queue = BFS(board)
+    queue.run()
+    vectorized = BFS(board, vectorized=True)
+    vectorized.run()
+    assert stats(vectorized) == stats(queue)
+
+
+@pytest.mark.parametrize("max_expanded", [1, 2, 1000, 1025, 50000])
+def test_stops_on_the_same_node_as_queue_bfs(max_expanded):
+    board = BOARDS[2]
+    queue = BFS(board, budget=Budget(max_expanded))
+    queue.run()
+    vectorized = BFS(board, budget=Budget(max_expanded), vectorized=True)
+    vectorized.run()
+    assert vectorized.status == "budget_exceeded"
+    assert stats(vectorized) == stats(queue)
+
+
+def test_layers_cover_every_reachable_board_once():
+    ranks = np.concatenate([layer[0] for layer in vector_bfs.layers(GOAL)])
+    assert len(ranks) == len(set(ranks.tolist())) == STATE_COUNT // 2
+    assert int(ranks[0]) == state_rank(GOAL)
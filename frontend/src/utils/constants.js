@@ -1,9 +1,15 @@
 export const ALGORITHMS = [
   { value: 'dfs', label: 'Depth-First Search (DFS)' },
   { value: 'bfs', label: 'Breadth-First Search (BFS)' },
+  { value: 'bfs_compact', label: 'Breadth-First Search (BFS, compact memory)' },
   { value: 'ids', label: 'Iterative DFS (IDS)' },
+  { value: 'bidirectional_bfs', label: 'Bidirectional BFS' },
   { value: 'a_star_m', label: 'A* Search using manhattan_distance' },
-  { value: 'a_star_e', label: 'A* Search using Euclidean Distance' }
+  { value: 'a_star_e', label: 'A* Search using Euclidean Distance' },
+  { value: 'a_star_lc', label: 'A* Search using Manhattan + Linear Conflict' },
+  { value: 'a_star_pdb', label: 'A* Search using Pattern Databases' },
+  { value: 'ida_star', label: 'IDA* using Manhattan + Linear Conflict' },
+  { value: 'table', label: 'Precomputed Distance Table' }
 ];
 
 export const INITIAL_PUZZLE = [